@@ -2,81 +2,69 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 from datetime import datetime
-from supabase import create_client, Client
 import hashlib
-import yagmail
-from datetime import datetime, time
+import functools
 import math
-# --- SUPABASE CONFIGURATION ---
-SUPABASE_URL = st.secrets["SUPABASE_URL"]
-SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-
-# utils/email_utils.py
-
-
-SENDER_EMAIL = st.secrets["SENDER_EMAIL"]
-APP_PASSWORD = st.secrets["APP_PASSWORD"]  # Keep this secure
-
-yag = yagmail.SMTP(SENDER_EMAIL, APP_PASSWORD)
-
-def send_welcome_email(to_email, name):
-    subject = f"Welcome to Task Tracker, {name}! 🎉"
-    body = f"""
-    <html>
-        <body style="font-family: Arial, sans-serif; color: #333; line-height: 1.6; background-color: #f9f9f9; padding: 20px;">
-            <div style="max-width: 600px; margin: auto; background: #fff; border-radius: 10px; padding: 30px; box-shadow: 0 2px 8px rgba(0,0,0,0.05);">
-                <h2 style="color: #4CAF50;">Welcome aboard, {name}! 🚀</h2>
-                
-                <p style="font-size: 18px;">You're all set to crush tasks and track wins.</p>
-                
-                <hr style="border: none; border-top: 1px solid #eee; margin: 20px 0;">
-                
-                <ul style="padding-left: 20px;">
-                    <li>✨ Add tasks in seconds</li>
-                    <li>🎯 Stay focused daily</li>
-                    <li>🏆 Earn points & celebrate wins</li>
-                </ul>
-                
-                <p style="margin-top: 30px;">Let’s make productivity fun.</p>
-
-                <blockquote style="font-style: italic; color: #777; margin-top: 30px;">
-                    “Success is the sum of small efforts, repeated day in and day out.” – Robert Collier
-                </blockquote>
-
-                <p style="color: #888; font-size: 14px; margin-top: 40px;">– Team S.A.R.A 💡</p>
-            </div>
-        </body>
-    </html>
-    """
-    print(f"Sending email to {to_email}...")
-    yag.send(to_email, subject, body)
-
-
-
-
-
-
-
-
+import os
+import threading
+from types import MappingProxyType
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from outbox import drain_outbox
+from task_sync import TaskSync
+from perf import PerfRecorder
+from task_stats import PERIODS, TaskStats
+from task_feed import LocalFeed, SupabaseRealtimeFeed
+from clients import get_smtp, get_supabase
+from bulk_tasks import PartialInsertError, insert_tasks, read_tasks_file, validate_tasks
+from constants import CATEGORY_COLORS, DEADLINE_CATEGORIES, DEADLINE_TIMES
+
+# Task frames are shared read-only across every session (task_sync.py). With
+# copy-on-write, a session that assigns into a frame (or a slice of one) gets
+# its own copy instead of silently modifying the shared data.
+pd.set_option("mode.copy_on_write", True)
+# --- CLIENTS ---
+# Supabase and SMTP clients are created lazily and shared process-wide (clients.py)
+
+@st.cache_resource
+def outbox_pool():
+    # Background thread that sends queued emails off the request path
+    return ThreadPoolExecutor(max_workers=1)
+
+def _drain_outbox(client, smtp):
+    try:
+        report = drain_outbox(client, lambda: smtp)
+        print(f"Email outbox: {report.summary()}")
+    except Exception as exc:
+        # The row stays pending and is picked up by the next drain
+        print(f"Email outbox drain failed: {exc!r}")
+
+
+# --- PERFORMANCE ---
+# Timing spans around the fetches, Supabase writes and tab renderers (perf.py),
+# shown in the admin Performance panel. TASK_PERF_LOG appends every span to a
+# JSON-lines file as well.
+TASK_PERF_LOG = os.getenv("TASK_PERF_LOG")
+
+@st.cache_resource
+def perf():
+    return PerfRecorder(log_path=TASK_PERF_LOG)
+
+def span(name):
+    return perf().span(name)
 
 
 # --- CONSTANTS ---
-CATEGORY_COLORS = {
-    "Work": "#4a90e2",
-    "Personal": "#f39c12",
-    "Health": "#27ae60",
-    "Learning": "#8e44ad",
-    "Other": "#95a5a6"
-}
+# CATEGORY_COLORS, DEADLINE_CATEGORIES and DEADLINE_TIMES live in constants.py
 
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Team Task Tracker", layout="wide")
 
 # --- FUNCTIONS ---
+@functools.lru_cache(maxsize=None)
 def avatar_url(name):
     hashed = hashlib.md5(name.encode()).hexdigest()
     return f"https://robohash.org/{hashed}?set=set5"
@@ -90,64 +78,182 @@ def get_badges(points):
     if points == 0: badges.append("Getting Started 🌱")
     return badges
 
-@st.cache_data(ttl=60)
-def load_tasks():
-    data = supabase.table("tasks").select("*").execute()
-    return pd.DataFrame(data.data) if data.data else pd.DataFrame(columns=[
-        "id", "user", "task", "points", "status", "date", "completed_date", "category"])
-
-DEADLINE_CATEGORIES = [
-    "⏳ No Deadline",
-    "⏰ Morning",
-    "🌤️ Afternoon",
-    "🌇 Evening",
-    "🌌 End of Day"
-]
-
-DEADLINE_TIMES = {
-    "⏰ Morning": time(10, 0),
-    "🌤️ Afternoon": time(14, 0),
-    "🌇 Evening": time(18, 0),
-    "🌌 End of Day": time(23, 59),
-    "⏳ No Deadline": None
-}
+BADGE_TIERS = [100, 50, 25, 10]
+
+def badge_labels(points):
+    # Vectorized get_badges over a points Series, joined the way the leaderboard shows them
+    conditions = [points >= tier for tier in BADGE_TIERS] + [points == 0]
+    choices = [", ".join(get_badges(tier)) for tier in BADGE_TIERS] + [", ".join(get_badges(0))]
+    return np.select(conditions, choices, default="")
+
+# Task data lives once per process: sessions only keep their filter selection
+# (and queued completions) in st.session_state and read the shared, read-only
+# view frames and derived structures. The view registry is an LRU capped at
+# MAX_TASK_VIEWS, so memory is bounded by distinct filter combinations in
+# recent use, not by the number of open browser tabs.
+MAX_TASK_VIEWS = 24
+
+# With TASK_REALTIME=1 inserts and updates are pushed from Supabase Realtime
+# (task_feed.py) into every view as they happen. While the feed is connected,
+# polling drops to a slow safety net for deletes and missed events; when it
+# drops, views go back to the normal interval.
+TASK_REALTIME = os.getenv("TASK_REALTIME", "0") == "1"
+TASK_SYNC_INTERVAL = 60
+SAFETY_NET_INTERVAL = 600
+
+def sync_interval():
+    return SAFETY_NET_INTERVAL if task_feed().connected else TASK_SYNC_INTERVAL
+
+@st.cache_resource
+def task_views():
+    return OrderedDict(), threading.Lock()
+
+def registered_view(key, create):
+    views, lock = task_views()
+    with lock:
+        if key in views:
+            views.move_to_end(key)
+        else:
+            views[key] = create()
+            while len(views) > MAX_TASK_VIEWS:
+                views.popitem(last=False)  # an evicted view is simply refetched on next use
+        return views[key]
+
+def task_view(user=None, category=None):
+    # Open tasks for the board (task_sync.py)
+    return registered_view((user, category, "open"), lambda: TaskSync(
+        get_supabase(), user=user, category=category, interval=TASK_SYNC_INTERVAL))
+
+def stats_view(user=None, category=None):
+    # Server-side points totals (task_stats.py) for the leaderboard and charts
+    return registered_view((user, category, "points"), lambda: TaskStats(
+        get_supabase(), user=user, category=category, interval=TASK_SYNC_INTERVAL))
+
+def load_tasks(user=None, category=None, resync=False):
+    with span("load_tasks"):
+        view = task_view(user, category)
+        view.interval = sync_interval()
+        return view.get(resync=resync)
+
+def load_stats(user=None, category=None, resync=False):
+    with span("load_stats"):
+        view = stats_view(user, category)
+        view.interval = sync_interval()
+        return view.get(resync=resync)
+
+def apply_task_rows(rows):
+    views, lock = task_views()
+    with lock:
+        views = list(views.values())
+    for view in views:
+        view.apply(rows)
+
+@st.cache_resource
+def task_feed():
+    # One feed per process: our own writes and (with realtime) everyone else's
+    # reach every session through the shared views
+    if TASK_REALTIME:
+        feed = SupabaseRealtimeFeed(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"]).start()
+    else:
+        feed = LocalFeed()
+    feed.subscribe(apply_task_rows)
+    return feed
 
 def add_task(user, task, points, category, deadline_category):
-    supabase.table("tasks").insert({
-        "user": user,
-        "task": task,
-        "points": points,
-        "status": False,
-        "date": datetime.now().strftime("%Y-%m-%d"),
-        "completed_date": None,
-        "category": category,
-        "deadline_category": deadline_category
-    }).execute()
-    st.cache_data.clear()
+    with span("supabase.add_task"):
+        result = get_supabase().table("tasks").insert({
+            "user": user,
+            "task": task,
+            "points": points,
+            "status": False,
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "completed_date": None,
+            "category": category,
+            "deadline_category": deadline_category
+        }).execute()
+    task_feed().publish(result.data)
 
 def add_user(name, email):
-    supabase.table("users").insert({
-        "user": name,
-        "mail": email,
-        "created_at": datetime.now().isoformat()
-    }).execute()
-    st.cache_data.clear()
-
+    # Inserts the user and queues the welcome email in one transaction
+    # (sql/email_outbox.sql); the email itself goes out in the background.
+    with span("supabase.add_user"):
+        get_supabase().rpc("create_user_with_welcome", {"user_name": name, "user_mail": email}).execute()
+    load_users.clear()
+    # Clients are resolved here, on the script thread, and handed to the worker
+    outbox_pool().submit(_drain_outbox, get_supabase(), get_smtp())
+
+
+def complete_tasks(task_ids):
+    with span("supabase.complete_tasks"):
+        result = get_supabase().table("tasks").update({
+            "status": True,
+            "completed_date": datetime.now().strftime("%Y-%m-%d")
+        }).in_("id", list(task_ids)).execute()
+    task_feed().publish(result.data)
 
 def complete_task(task_id):
-    supabase.table("tasks").update({
-        "status": True,
-        "completed_date": datetime.now().strftime("%Y-%m-%d")
-    }).eq("id", task_id).execute()
-    st.cache_data.clear()
+    complete_tasks([task_id])
 
 def edit_task(task_id, new_task, new_points, new_category):
-    supabase.table("tasks").update({
-        "task": new_task,
-        "points": new_points,
-        "category": new_category
-    }).eq("id", task_id).execute()
-    st.cache_data.clear()
+    with span("supabase.edit_task"):
+        result = get_supabase().table("tasks").update({
+            "task": new_task,
+            "points": new_points,
+            "category": new_category
+        }).eq("id", task_id).execute()
+    task_feed().publish(result.data)
+
+# --- WRITE-BEHIND COMPLETIONS ---
+# Checking a task off only queues it in the session and hides it from the board;
+# the queue is written as one bulk update after FLUSH_AFTER seconds, once
+# FLUSH_BATCH tasks are waiting, or when the user switches to another view.
+FLUSH_AFTER = 5
+FLUSH_BATCH = 20
+
+def pending_completions():
+    return st.session_state.setdefault("pending_completions", {})  # task id -> queued at
+
+def queue_completion(task_id):
+    pending_completions()[task_id] = datetime.now().timestamp()
+
+def flush_completions(force=False):
+    pending = pending_completions()
+    if not pending:
+        return False
+    waited = datetime.now().timestamp() - min(pending.values())
+    if not force and len(pending) < FLUSH_BATCH and waited < FLUSH_AFTER:
+        return False
+    task_ids = list(pending)
+    try:
+        complete_tasks(task_ids)
+    except Exception as exc:
+        # Keep the queue: the tasks stay checked off here and the next tick retries
+        print(f"Flushing {len(task_ids)} completions failed: {exc!r}")
+        st.warning(f"Couldn't save {len(task_ids)} completed task(s) yet, retrying shortly.")
+        return False
+    for task_id in task_ids:
+        pending.pop(task_id, None)
+    return True
+
+@st.fragment(run_every=FLUSH_AFTER)
+def completion_flusher():
+    if flush_completions():
+        st.rerun()  # one full rerun per batch so the leaderboard and charts catch up
+
+# --- LIVE UPDATES ---
+# Pushed rows land in the shared views (task_feed), but Streamlit only redraws
+# a session when its script runs. Each session polls the versions of the views
+# it rendered, which is a local read, and reruns only when one of them moved,
+# so a change in another user's or category's view costs it nothing. The views
+# are looked up by filter on every tick: one evicted from task_views() comes
+# back as a fresh, unloaded view, whose version differs and triggers the rerun.
+LIVE_POLL = 2
+
+@st.fragment(run_every=LIVE_POLL)
+def live_updates(user, category, rendered):
+    views = (task_view(user, category), stats_view(user, category))
+    if tuple(view.version for view in views) != rendered:
+        st.rerun()
 
 # --- SIDEBAR ---
 # def show_sidebar():
@@ -170,7 +276,7 @@ def edit_task(task_id, new_task, new_points, new_category):
 
 @st.cache_data(ttl=60)
 def load_users():
-    data = supabase.table("users").select("user").execute()
+    data = get_supabase().table("users").select("user").execute()
     # print(data)
     return sorted([user["user"] for user in data.data]) if data.data else []
 
@@ -187,13 +293,12 @@ def show_sidebar():
         new_name = st.sidebar.text_input("Enter your name")
         new_email = st.sidebar.text_input("Enter your email")
         if st.sidebar.button("Create User") and new_name and new_email:
-            existing = supabase.table("users").select("id").eq("mail", new_email).execute().data
+            existing = get_supabase().table("users").select("id").eq("mail", new_email).execute().data
 
             if existing:
                 st.warning("A user with this email already exists. Please use a different email or choose 'Existing User'.")
             else:
                 add_user(new_name, new_email)
-                send_welcome_email(new_email, new_name)
                 st.session_state.user = new_name
                 st.success(f"Welcome, {new_name}!")
                 st.rerun()
@@ -227,38 +332,93 @@ def show_sidebar():
     return dark_mode, admin_mode
 
 
+def show_bulk_import():
+    with st.sidebar.expander("📥 Bulk Import Tasks"):
+        upload = st.file_uploader("CSV, JSONL or Parquet", type=["csv", "jsonl", "parquet"])
+        st.caption("Columns: user, task, points, category, deadline_category, date, status, completed_date. "
+                   "Rows without a user are yours; rows with status true are imported as completed.")
+        if upload is not None and st.button("Import Tasks"):
+            try:
+                df = read_tasks_file(upload, upload.name)
+            except Exception as exc:
+                # Unsupported extension, or a file its parser can't read
+                st.error(f"Could not read {upload.name}: {exc}")
+                return
+            rows, errors = validate_tasks(df, default_user=st.session_state.user)
+            for error in errors[:20]:
+                st.warning(error)
+            if rows:
+                try:
+                    with span("supabase.insert_tasks"):
+                        inserted = insert_tasks(get_supabase(), rows)
+                except PartialInsertError as exc:
+                    task_feed().publish(exc.inserted)
+                    st.error(f"Import stopped after {len(exc.inserted)} of {len(rows)} tasks: {exc.__cause__}")
+                    return
+                task_feed().publish(inserted)
+                st.success(f"Imported {len(rows)} tasks! 📥")
+
+def show_performance():
+    # Rolling timings of the last WINDOW samples per span, slowest p95 first
+    with st.sidebar.expander("⏱️ Performance"):
+        rows = perf().summary()
+        if not rows:
+            st.caption("No timings recorded yet.")
+            return
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+        st.download_button("Export JSON lines", perf().export_jsonl(), file_name="perf.jsonl",
+                           mime="application/jsonl")
+        if st.button("Reset timings"):
+            perf().reset()
+            st.rerun()
+
+
 # --- MAIN APP LAYOUT ---
 def main():
     st.title("Team Task Tracker 🚀")
     dark_mode, admin_mode = show_sidebar()
 
-    df = load_tasks()
-    if df.empty:
-        st.info("No tasks yet. Add some in the sidebar! 🌟")
-        return
-
-    df['date'] = pd.to_datetime(df['date'])
-    df['completed_date'] = pd.to_datetime(df['completed_date'])
+    resync = bool(admin_mode) and st.sidebar.button("🔄 Full Resync")
+    if admin_mode:
+        show_bulk_import()
+        show_performance()
 
-    user_filter = st.selectbox("Filter by user", ["All"] + sorted(df['user'].unique().tolist()))
+    with span("load_users"):
+        users = load_users()  # mostly a cache hit, but that is what a rerun pays
+    user_filter = st.selectbox("Filter by user", ["All"] + users)
     category_filter = st.selectbox("Filter by category", ["All"] + list(CATEGORY_COLORS.keys()))
 
-    if user_filter != "All":
-        df = df[df['user'] == user_filter]
-    if category_filter != "All":
-        df = df[df['category'] == category_filter]
+    # Filters are pushed down into the Supabase query; the board only needs open
+    # tasks and the charts only need points totals, summed in the database.
+    user = None if user_filter == "All" else user_filter
+    category = None if category_filter == "All" else category_filter
+    if st.session_state.get("current_view") != (user, category):
+        st.session_state.current_view = (user, category)
+        flush_completions(force=True)
+    completion_flusher()
+    task_feed()
+    views = (task_view(user, category), stats_view(user, category))
+    open_df = load_tasks(user, category, resync=resync)
+    stats = load_stats(user, category, resync=resync)
+    live_updates(user, category, tuple(view.version for view in views))
+    if open_df.empty and stats["user"].empty:
+        st.info("No tasks yet. Add some in the sidebar! 🌟")
+        return
+    tasks_by_user = views[0].derive("by_user", index_open_tasks)
+    leaderboard = views[1].derive("leaderboard", build_leaderboard)
+    progress = views[1].derive("progress", build_progress)
 
     # --- TABS ---
     tab1, tab2, tab3 = st.tabs(["📋 Active Tasks", "🏆 Leaderboard", "📈 Progress"])
 
-    with tab1:
-        show_tasks(df, admin_mode)
+    with tab1, span("show_tasks"):
+        show_tasks(tasks_by_user, admin_mode)
 
-    with tab2:
-        show_leaderboard(df)
+    with tab2, span("show_leaderboard"):
+        show_leaderboard(leaderboard)
 
-    with tab3:
-        show_progress_over_time(df)
+    with tab3, span("show_progress_over_time"):
+        show_progress_over_time(progress)
 
     with st.expander("How to Use this App ❓"):
         st.write("""
@@ -284,14 +444,30 @@ def main():
 # --- ACTIVE TASKS ---
 import math
 
-def show_tasks(df, admin_mode):
-    if df.empty:
+def index_open_tasks(df):
+    # user -> open tasks as lightweight namedtuples, in first-seen user order.
+    # Built through TaskSync.derive, so only once per version of the task data.
+    # df is an open-only view, so it is grouped as is without a filtered copy.
+    # Shared by every session, so it is handed out read-only.
+    return MappingProxyType({
+        user: tuple(group.itertuples(index=False, name="OpenTask"))
+        for user, group in df.groupby('user', sort=False, observed=True)
+    })
+
+# The board renders one page of users per rerun and only the first few tasks
+# of each user, so the element tree stays bounded however big the team gets.
+USERS_PER_PAGE = 9
+TASKS_PER_USER = 5
+
+def show_tasks(tasks_by_user, admin_mode):
+    if not tasks_by_user:
         st.warning("No tasks found for the current user.")
         return  # Exit the function early
-    users = df['user'].unique()
-    if len(users) == 0:
-        st.info("No users found with tasks.")
-        return
+    users = list(tasks_by_user)
+    total_pages = math.ceil(len(users) / USERS_PER_PAGE)
+    if total_pages > 1:
+        page = st.selectbox("Page", range(1, total_pages + 1), format_func=lambda p: f"Page {p} of {total_pages}", key="board_page")
+        users = users[(page - 1) * USERS_PER_PAGE:page * USERS_PER_PAGE]
     # Define number of users per row
     users_per_row = 3  # Or whatever you want as the max columns per row
     total_rows = math.ceil(len(users) / users_per_row)
@@ -307,29 +483,31 @@ def show_tasks(df, admin_mode):
                 with cols[idx]:
                     st.image(avatar_url(user), width=50)
                     st.markdown(f"**{user}**")
-                    user_tasks = df[(df['user'] == user) & (~df['status'])]
-                    for _, task in user_tasks.iterrows():
-                        color = CATEGORY_COLORS.get(task['category'], "#ccc")
-                        task_key = f"{task['id']}"
-                        checked = st.checkbox(task['task'], key=task_key)
-                        if checked and not task['status']:
-                            complete_task(task['id'])
-                            st.rerun()
-                        deadline = task["deadline_category"]
+                    pending = pending_completions()
+                    user_tasks = [task for task in tasks_by_user[user] if task.id not in pending]
+                    limit = st.session_state.get(f"limit_{user}", TASKS_PER_USER)
+                    for task in user_tasks[:limit]:
+                        task_key = f"{task.id}"
+                        st.checkbox(task.task, key=task_key, on_change=queue_completion, args=(task.id,))
+                        deadline = task.deadline_category
                         if deadline:
-                            st.markdown(f"⭐ {task['points']} pts | 🏷️ {task['category']} | {deadline} ")
+                            st.markdown(f"⭐ {task.points} pts | 🏷️ {task.category} | {deadline} ")
                         else:
-                            st.markdown(f"⭐ {task['points']} pts | 🏷️ {task['category']} | 📅 No Deadline")
-
-                    if admin_mode:
-                        with st.expander("Edit Task"):
-                            new_task = st.text_input("Edit description", value=task['task'], key=f"edit_{task['id']}_task")
-                            new_points = st.slider("Edit points", 1, 10, value=task['points'], key=f"edit_{task['id']}_points")
-                            new_category = st.selectbox("Edit category", list(CATEGORY_COLORS.keys()), index=list(CATEGORY_COLORS.keys()).index(task['category']), key=f"edit_{task['id']}_cat")
-                            if st.button("Save Changes", key=f"save_{task['id']}"):
-                                edit_task(task['id'], new_task, new_points, new_category)
-                                st.success("Task updated!")
-                                st.rerun()
+                            st.markdown(f"⭐ {task.points} pts | 🏷️ {task.category} | 📅 No Deadline")
+                    hidden = len(user_tasks) - limit
+                    if hidden > 0 and st.button(f"Load more ({hidden} hidden)", key=f"more_{user}"):
+                        st.session_state[f"limit_{user}"] = limit + TASKS_PER_USER
+                        st.rerun()
+
+                    # The edit widgets are only built once the toggle is switched on
+                    if admin_mode and user_tasks and st.toggle("Edit Task", key=f"edit_open_{user}"):
+                        new_task = st.text_input("Edit description", value=task.task, key=f"edit_{task.id}_task")
+                        new_points = st.slider("Edit points", 1, 10, value=task.points, key=f"edit_{task.id}_points")
+                        new_category = st.selectbox("Edit category", list(CATEGORY_COLORS.keys()), index=list(CATEGORY_COLORS.keys()).index(task.category), key=f"edit_{task.id}_cat")
+                        if st.button("Save Changes", key=f"save_{task.id}"):
+                            edit_task(task.id, new_task, new_points, new_category)
+                            st.success("Task updated!")
+                            st.rerun()
         # Add space after each row of users (to handle varying lengths of user task lists)
         st.write("")  # This will add some space after each row of columns
 
@@ -414,21 +592,27 @@ def show_tasks(df, admin_mode):
                 #             st.rerun()
 
 # --- LEADERBOARD ---
-def show_leaderboard(df):
-    completed = df[df['status']]
-    totals = completed.groupby('user')['points'].sum().reset_index().sort_values(by='points', ascending=False)
+def build_leaderboard(stats):
+    # Points per user (summed server-side), with badges and avatars resolved up
+    # front. Materialized through TaskStats.derive, so a rerun only walks users.
+    totals = stats['user'].sort_values(by='points', ascending=False, kind='stable', ignore_index=True)
+    totals['badges'] = badge_labels(totals['points'])
+    totals['avatar'] = totals['user'].map(avatar_url)
+    totals['progress'] = totals['points'].clip(upper=100) / 100
+    return totals
+
+def show_leaderboard(totals):
     col1, col2 = st.columns(2)
     with col1:
         st.markdown("### Top Users 🧑‍🚀")
-        for _, row in totals.iterrows():
-            st.image(avatar_url(row['user']), width=40)
-            st.markdown(f"**{row['user']}** — {row['points']} pts")
-            st.markdown(", ".join(get_badges(row['points'])))
-            progress = min(row['points'], 100)
-            st.progress(progress / 100)
+        for row in totals.itertuples(index=False):
+            st.image(row.avatar, width=40)
+            st.markdown(f"**{row.user}** — {row.points} pts")
+            st.markdown(row.badges)
+            st.progress(row.progress)
     with col2:
         st.markdown("### 📊 Total Points Bar Chart")
-        chart = alt.Chart(totals).mark_bar().encode(
+        chart = alt.Chart(totals[['user', 'points']]).mark_bar().encode(
             x=alt.X('user', sort='-y'),
             y='points',
             color='user'
@@ -436,21 +620,20 @@ def show_leaderboard(df):
         st.altair_chart(chart, use_container_width=True)
 
 # --- PROGRESS OVER TIME ---
-def show_progress_over_time(df):
-    df = df[df['status']]
-    view_by = st.radio("View progress by", ["Week", "Month"], horizontal=True)
-    if view_by == "Week":
-        df['period'] = df['completed_date'].dt.strftime('%Y-%U')
-    else:
-        df['period'] = df['completed_date'].dt.strftime('%Y-%m')
+def build_progress(stats):
+    # Points per user per ISO week and per month, bucketed server-side
+    # (task_stats.PERIODS); switching the Week/Month radio is a lookup.
+    return {view_by: stats[view_by] for view_by in PERIODS}
 
-    progress = df.groupby(['user', 'period'])['points'].sum().reset_index()
-    chart = alt.Chart(progress).mark_line(point=True).encode(
-        x='period',
+def show_progress_over_time(progress):
+    view_by = st.radio("View progress by", ["Week", "Month"], horizontal=True)
+    chart = alt.Chart(progress[view_by]).mark_line(point=True).encode(
+        x='period:T',
         y='points',
         color='user'
     )
     st.altair_chart(chart, use_container_width=True)
 
 if __name__ == '__main__':
-    main()
+    with span("rerun"):
+        main()
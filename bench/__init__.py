@@ -0,0 +1,2 @@
+# Benchmarks for the dashboard data paths; run from the repo root, e.g.
+# python -m bench.memory_footprint, python -m bench.dashboard
@@ -0,0 +1,148 @@
+# bench/dashboard.py
+# Wall time and peak memory of each dashboard stage on synthetic teams, with
+# the Supabase client replaced by the in-memory fake (bench/fake_supabase.py).
+# Each run is compared with the stored baseline for its size, so regressions
+# show up as diffs; --save records the run as the new baseline.
+#
+#   python -m bench.dashboard --sizes small medium
+#   python -m bench.dashboard --users 250 --tasks 50000 --save
+#
+# The show_* renderers run in Streamlit's bare mode (no server): the elements
+# are built but not sent anywhere, so this times our Python, not the browser.
+# Seconds are the best of --repeat runs; peak memory comes from one extra run
+# under tracemalloc.
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+from bench.fake_supabase import FakeSupabase
+from bench.synthetic import make_tasks, make_users
+from constants import CATEGORY_COLORS
+
+SIZES = {
+    "small": (10, 1_000),
+    "medium": (100, 100_000),
+    "large": (1_000, 1_000_000),
+}
+MIN_SECONDS = 0.005  # slowdowns below these are timer / allocator noise, never flagged
+MIN_MB = 0.5
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines", "dashboard.json")
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return value, {"seconds": round(min(times), 6), "peak_mb": round(peak / 2**20, 3)}
+
+
+def run(n_users, n_tasks, repeat=3):
+    import app  # imported here so --help works without Streamlit
+    from streamlit.logger import set_log_level
+    from task_stats import TaskStats
+    from task_sync import TaskSync
+
+    set_log_level("error")  # bare mode warns about the missing script context on every element
+
+    client = FakeSupabase(tasks=make_tasks(n_tasks, n_users), users=make_users(n_users))
+    user, category = make_users(1)[0]["user"], next(iter(CATEGORY_COLORS))
+    results = {}
+
+    def stage(name, fn):
+        value, results[name] = measure(fn, repeat)
+        return value
+
+    open_df = stage("load_tasks", lambda: TaskSync(client).get())
+    stats = stage("load_stats", lambda: TaskStats(client).get())
+    stage("filter", lambda: (TaskSync(client, user=user, category=category).get(),
+                             TaskStats(client, user=user, category=category).get()))
+    tasks_by_user = stage("index_open_tasks", lambda: app.index_open_tasks(open_df))
+    stage("show_tasks", lambda: app.show_tasks(tasks_by_user, admin_mode=False))
+    stage("show_leaderboard", lambda: app.show_leaderboard(app.build_leaderboard(stats)))
+    stage("show_progress_over_time", lambda: app.show_progress_over_time(app.build_progress(stats)))
+    return results
+
+
+def compare(label, results, baseline, tolerance):
+    # Prints one line per stage; returns the stages over baseline * (1 + tolerance)
+    # by more than the MIN_SECONDS / MIN_MB noise floor
+    regressions = []
+    print(f"\n{label}")
+    print(f"{'stage':<24} {'seconds':>10} {'baseline':>10} {'diff':>8} {'peak MB':>9} {'baseline':>9} {'diff':>8}")
+    for name, now in results.items():
+        base = baseline.get(name)
+        cells = [f"{name:<24}", f"{now['seconds']:>10.4f}"]
+        if base:
+            cells += [f"{base['seconds']:>10.4f}", f"{diff(now['seconds'], base['seconds']):>8}"]
+        else:
+            cells += [f"{'-':>10}", f"{'':>8}"]
+        cells.append(f"{now['peak_mb']:>9.2f}")
+        if base:
+            cells += [f"{base['peak_mb']:>9.2f}", f"{diff(now['peak_mb'], base['peak_mb']):>8}"]
+        flagged = base and (over(now["seconds"], base["seconds"], tolerance, MIN_SECONDS)
+                            or over(now["peak_mb"], base["peak_mb"], tolerance, MIN_MB))
+        if flagged:
+            regressions.append(name)
+        print(" ".join(cells) + ("  <- regression" if flagged else ""))
+    return regressions
+
+
+def over(now, base, tolerance, floor):
+    return now > base * (1 + tolerance) and now - base > floor
+
+
+def diff(now, base):
+    return f"{(now - base) / base:+.0%}" if base else ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard hot-path benchmark on synthetic data")
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=["small", "medium"])
+    parser.add_argument("--users", type=int, help="custom size, together with --tasks")
+    parser.add_argument("--tasks", type=int)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [(args.users, args.tasks)] if args.users and args.tasks else [SIZES[name] for name in args.sizes]
+    try:
+        with open(args.baselines, encoding="utf-8") as f:
+            baselines = json.load(f)
+    except FileNotFoundError:
+        baselines = {}
+
+    regressions = []
+    for n_users, n_tasks in sizes:
+        label = f"{n_users} users, {n_tasks} tasks"
+        key = f"u{n_users}-t{n_tasks}"
+        results = run(n_users, n_tasks, repeat=args.repeat)
+        regressions += [f"{key}:{name}" for name in compare(label, results, baselines.get(key, {}), args.tolerance)]
+        baselines[key] = results
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baselines), exist_ok=True)
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaselines written to {args.baselines}")
+    elif regressions:
+        print(f"\nRegressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
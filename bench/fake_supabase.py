@@ -0,0 +1,217 @@
+# bench/fake_supabase.py
+# In-memory stand-in for the Supabase client, covering the query builder calls
+# and RPCs the app and jobs make. Rows are plain dicts in the JSON shape
+# Supabase returns, and every execute() hands out fresh dicts, like decoding a
+# response would, so the cost of materializing results is still measured.
+#
+# Like postgrest-py, the builder mutates in place and order/limit/range append
+# query params, so re-paging one builder piles up offset/limit pairs. Those
+# would be ambiguous to PostgREST, so the fake refuses them instead of
+# quietly picking one.
+#
+# Like a default PostgREST, a response carries at most MAX_ROWS rows (table
+# selects and RPCs alike), so a caller that doesn't page loses rows here too.
+
+from datetime import date, timedelta
+
+MAX_ROWS = 1000  # PostgREST's default max-rows
+
+OPS = {
+    "eq": lambda a, b: a == b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+}
+
+
+def _coerce(value, like):
+    # PostgREST filter values arrive as text; compare them as the column's type
+    if isinstance(value, str) and isinstance(like, bool):
+        return value.lower() == "true"
+    if isinstance(value, str) and isinstance(like, int):
+        return int(value)
+    return value
+
+
+def _split_terms(expression):
+    # Top-level comma split; commas inside and(...) / or(...) stay with their group
+    terms, depth, start = [], 0, 0
+    for i, char in enumerate(expression):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            terms.append(expression[start:i])
+            start = i + 1
+    terms.append(expression[start:])
+    return terms
+
+
+def _logic(expression, combine=any):
+    # PostgREST logic tree: "a.eq.1,and(b.eq.2,c.lt.3)" -> row predicate
+    checks = []
+    for term in _split_terms(expression):
+        for name, inner in (("and(", all), ("or(", any)):
+            if term.startswith(name) and term.endswith(")"):
+                checks.append(_logic(term[len(name):-1], inner))
+                break
+        else:
+            column, op, value = term.split(".", 2)
+            checks.append(lambda row, column=column, op=op, value=value:
+                          OPS[op](row.get(column), _coerce(value, row.get(column))))
+    return lambda row: combine(check(row) for check in checks)
+
+
+def _period_start(day, period):
+    day = date.fromisoformat(day[:10])
+    if period == "week":
+        return (day - timedelta(days=day.weekday())).isoformat()  # ISO weeks start on Monday
+    return day.replace(day=1).isoformat()
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, rows, action="select", payload=None):
+        self._rows = rows
+        self._action = action
+        self._payload = payload
+        self._columns = None
+        self._filters = []
+        self._params = []  # (name, value), appended like postgrest-py does
+
+    def select(self, columns="*"):
+        if columns.strip() != "*":
+            self._columns = [column.strip() for column in columns.split(",")]
+        return self
+
+    def insert(self, rows):
+        return FakeQuery(self._rows, "insert", rows if isinstance(rows, list) else [rows])
+
+    def update(self, values):
+        return FakeQuery(self._rows, "update", values)
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def in_(self, column, values):
+        values = set(values)
+        self._filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def or_(self, expression):
+        # "id.gt.10,completed_date.gte.2024-01-01", groups like "and(a.eq.1,b.lt.2)" nest
+        self._filters.append(_logic(expression))
+        return self
+
+    def order(self, column, desc=False):
+        self._params.append(("order", (column, desc)))
+        return self
+
+    def limit(self, count):
+        self._params.append(("limit", count))
+        return self
+
+    def range(self, start, end):
+        self._params += [("offset", start), ("limit", end - start + 1)]
+        return self
+
+    def execute(self):
+        if self._action == "insert":
+            next_id = max((row["id"] for row in self._rows), default=0) + 1
+            inserted = []
+            for offset, row in enumerate(self._payload):
+                inserted.append(dict(row, id=next_id + offset))
+            self._rows.extend(inserted)
+            return FakeResponse([dict(row) for row in inserted])
+        matched = [row for row in self._rows if all(check(row) for check in self._filters)]
+        if self._action == "update":
+            for row in matched:
+                row.update(self._payload)
+            return FakeResponse([dict(row) for row in matched])
+        params = {}
+        for name, value in self._params:
+            if name in params:
+                raise ValueError(f"duplicate {name!r} query param; postgrest builders can't be reused across pages")
+            params[name] = value
+        if "order" in params:
+            column, desc = params["order"]
+            matched.sort(key=lambda row: row[column], reverse=desc)
+        offset = params.get("offset", 0)
+        matched = matched[offset:offset + min(params.get("limit", MAX_ROWS), MAX_ROWS)]
+        if self._columns is None:
+            return FakeResponse([dict(row) for row in matched])
+        return FakeResponse([{column: row.get(column) for column in self._columns} for row in matched])
+
+    def _filter(self, column, op, value):
+        self._filters.append(lambda row: OPS[op](row.get(column), value))
+        return self
+
+
+class FakeRPC:
+    def __init__(self, data):
+        self._data = data
+
+    def execute(self):
+        return FakeResponse(self._data[:MAX_ROWS])
+
+
+class FakeSupabase:
+    def __init__(self, tasks=(), users=()):
+        self.tables = {"tasks": list(tasks), "users": list(users)}
+
+    def table(self, name):
+        return FakeQuery(self.tables.setdefault(name, []))
+
+    def rpc(self, name, params=None):
+        return FakeRPC(getattr(self, f"_rpc_{name}")(**(params or {})))
+
+    def _done(self, user_filter, category_filter):
+        return [row for row in self.tables["tasks"] if row["status"]
+                and (user_filter is None or row["user"] == user_filter)
+                and (category_filter is None or row["category"] == category_filter)]
+
+    # Same results as sql/task_points.sql
+    def _rpc_points_per_user(self, user_filter=None, category_filter=None, after_user=None, page_size=1000):
+        totals = {}
+        for row in self._done(user_filter, category_filter):
+            if after_user is None or row["user"] > after_user:
+                totals[row["user"]] = totals.get(row["user"], 0) + row["points"]
+        return [{"user": user, "points": points} for user, points in sorted(totals.items())[:page_size]]
+
+    def _rpc_points_per_period(self, period, user_filter=None, category_filter=None,
+                               after_user=None, after_period=None, page_size=1000):
+        if period not in ("week", "month"):
+            return []
+        totals = {}
+        for row in self._done(user_filter, category_filter):
+            if row["completed_date"] and (after_user is None or row["user"] >= after_user):
+                key = (row["user"], _period_start(row["completed_date"], period))
+                totals[key] = totals.get(key, 0) + row["points"]
+        return [{"user": user, "period_start": start, "points": points}
+                for (user, start), points in sorted(totals.items())
+                if after_user is None or (user, start) > (after_user, after_period)][:page_size]
+
+    # Same results as sql/users_without_tasks.sql
+    def _rpc_users_without_tasks(self, day, after_id=0, page_size=1000):
+        busy = {row["user"] for row in self.tables["tasks"] if row["date"] == str(day)}
+        users = sorted((row for row in self.tables["users"] if row["id"] > after_id and row["user"] not in busy),
+                       key=lambda row: row["id"])
+        return [{"id": row["id"], "user": row["user"], "mail": row["mail"]} for row in users[:page_size]]
@@ -0,0 +1,87 @@
+# bench/memory_footprint.py
+# Memory the task data keeps alive as the number of sessions grows, measured
+# with tracemalloc while N simulated sessions load their data:
+#
+#   before: every session built its own copy of the whole tasks table (object
+#           columns, parsed dates), as the app did before task data was shared
+#   after:  the current app path, sessions call TaskSync.get() / derive() for
+#           the open-task board and TaskStats.get() / derive() for the points
+#           totals, through the in-memory fake Supabase client
+#
+# The app no longer holds the completed-task history at all (the leaderboard
+# and charts read server-side totals), so "after" is the open tasks plus a few
+# aggregate rows.
+#
+#   python -m bench.memory_footprint --tasks 100000 --users 200 --sessions 1 5 20
+
+import argparse
+import tracemalloc
+
+import pandas as pd
+
+from bench.fake_supabase import FakeSupabase
+from bench.synthetic import make_tasks
+
+
+def retained(start_session, sessions):
+    # Bytes still allocated once `sessions` sessions hold what they loaded
+    tracemalloc.start()
+    try:
+        session = start_session()
+        held = [session() for _ in range(sessions)]
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del held
+    return current
+
+
+def before(rows):
+    def start_session():
+        def session():
+            df = pd.DataFrame(rows)
+            df['date'] = pd.to_datetime(df['date'])
+            df['completed_date'] = pd.to_datetime(df['completed_date'])
+            return df
+        return session
+    return start_session
+
+
+def after(client):
+    import app  # imported here so --help works without Streamlit
+    from streamlit.logger import set_log_level
+    from task_stats import TaskStats
+    from task_sync import TaskSync
+
+    set_log_level("error")  # bare mode warns about the missing script context on every element
+
+    def start_session():
+        # One process-wide view and stats object, shared by every session
+        view, stats = TaskSync(client), TaskStats(client)
+
+        def session():
+            return (view.get(), view.derive("by_user", app.index_open_tasks),
+                    stats.get(), stats.derive("leaderboard", app.build_leaderboard))
+        return session
+    return start_session
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-session memory of the task data")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 20, 100])
+    args = parser.parse_args(argv)
+
+    rows = make_tasks(args.tasks, args.users)
+    client = FakeSupabase(tasks=rows)
+    print(f"{args.tasks} tasks, {args.users} users")
+    print(f"{'sessions':>8} {'before MB':>10} {'after MB':>10}")
+    for sessions in args.sessions:
+        old = retained(before(rows), sessions)
+        new = retained(after(client), sessions)
+        print(f"{sessions:>8} {old / 2**20:>10.1f} {new / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
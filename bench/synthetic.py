@@ -0,0 +1,36 @@
+# bench/synthetic.py
+# Synthetic users/tasks rows shaped like the Supabase JSON the app receives.
+
+import random
+from datetime import date, timedelta
+
+from constants import CATEGORY_COLORS, DEADLINE_CATEGORIES
+
+
+def make_users(n_users):
+    return [{"id": i, "user": f"user{i:04d}", "mail": f"user{i:04d}@example.com"} for i in range(1, n_users + 1)]
+
+
+def make_tasks(n_tasks, n_users, days=365, open_share=0.05, seed=0):
+    # One year of history by default; the newest `open_share` of tasks are still open
+    rng = random.Random(seed)
+    users = [user["user"] for user in make_users(n_users)]
+    categories = list(CATEGORY_COLORS)
+    start = date.today() - timedelta(days=days)
+    first_open = int(n_tasks * (1 - open_share))
+    rows = []
+    for i in range(1, n_tasks + 1):
+        created = start + timedelta(days=(i * days) // n_tasks)
+        done = i <= first_open
+        rows.append({
+            "id": i,
+            "user": rng.choice(users),
+            "task": f"Synthetic task {i} " + "x" * rng.randint(5, 40),
+            "points": rng.randint(1, 10),
+            "status": done,
+            "date": created.isoformat(),
+            "completed_date": (created + timedelta(days=rng.randint(0, 3))).isoformat() if done else None,
+            "category": rng.choice(categories),
+            "deadline_category": rng.choice(DEADLINE_CATEGORIES),
+        })
+    return rows
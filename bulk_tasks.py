@@ -0,0 +1,207 @@
+# bulk_tasks.py
+# Bulk import and export for the tasks table.
+#
+# Import reads CSV, JSON lines or Parquet, validates every row against
+# CATEGORY_COLORS / DEADLINE_CATEGORIES and inserts the valid ones in chunks.
+# Rows may carry status / completed_date, so finished history from another
+# tracker comes in as completed tasks instead of landing on the Active board.
+# Export streams the whole history to Parquet one keyset page at a time, so
+# memory stays flat however big the table is.
+#
+#   python bulk_tasks.py import tasks.csv [--user NAME]
+#   python bulk_tasks.py export tasks.parquet
+#
+# The CLI reads its credentials like the cron jobs do (jobs/config.py).
+
+import argparse
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+from constants import CATEGORY_COLORS, DEADLINE_CATEGORIES
+
+CHUNK_SIZE = 500
+PAGE_SIZE = 1000
+TRUE_VALUES = {"true", "1", "yes", "done"}
+FALSE_VALUES = {"false", "0", "no", "open", ""}
+READERS = {
+    ".csv": pd.read_csv,
+    ".jsonl": lambda f: pd.read_json(f, lines=True),
+    ".parquet": pd.read_parquet,
+}
+
+
+class PartialInsertError(RuntimeError):
+    # A chunk failed; `inserted` holds the rows written by the chunks before it
+    def __init__(self, inserted, cause):
+        super().__init__(f"{len(inserted)} tasks inserted before a chunk failed: {cause!r}")
+        self.inserted = inserted
+
+
+def parse_day(value):
+    # ISO date (or datetime / Timestamp) -> "YYYY-MM-DD", None if it isn't one
+    try:
+        return date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return None
+
+
+def parse_status(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    return None
+
+
+def parse_points(value):
+    # Whole numbers only: 3, 3.0 (a CSV column with gaps is read as float) or
+    # "3"; None for 3.7 rather than silently truncating it
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else None
+
+
+def read_tasks_file(file, name=None):
+    # `file` is a path or a file-like object (e.g. a Streamlit upload); the
+    # format is taken from the extension of `name` (or of the path).
+    ext = os.path.splitext(name or file)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unsupported file type {ext!r}, expected one of {', '.join(READERS)}")
+    return READERS[ext](file)
+
+
+def validate_tasks(df, default_user=None):
+    # Returns (rows ready to insert, ["row N: problem", ...])
+    rows, errors = [], []
+    today = datetime.now().strftime("%Y-%m-%d")
+    for n, record in enumerate(df.to_dict("records"), start=1):
+        record = {k: v for k, v in record.items() if not (pd.api.types.is_scalar(v) and pd.isna(v))}
+        user = record.get("user") or default_user
+        task = str(record.get("task") or "").strip()
+        category = record.get("category", "Other")
+        deadline = record.get("deadline_category", DEADLINE_CATEGORIES[0])
+        day = parse_day(record.get("date") or today)
+        status = parse_status(record.get("status", False))
+        completed = record.get("completed_date")
+        completed_day = parse_day(completed) if completed else None
+        points = parse_points(record.get("points", 3))
+
+        problems = []
+        if not user:
+            problems.append("missing user")
+        if not task:
+            problems.append("missing task")
+        if points is None or not 1 <= points <= 10:
+            problems.append(f"points must be a whole number 1-10, got {record.get('points')!r}")
+        if category not in CATEGORY_COLORS:
+            problems.append(f"unknown category {category!r}")
+        if deadline not in DEADLINE_CATEGORIES:
+            problems.append(f"unknown deadline {deadline!r}")
+        if day is None:
+            problems.append(f"date must be YYYY-MM-DD, got {record.get('date')!r}")
+        if status is None:
+            problems.append(f"status must be true/false, got {record.get('status')!r}")
+        if completed and completed_day is None:
+            problems.append(f"completed_date must be YYYY-MM-DD, got {completed!r}")
+        elif completed and status is False:
+            problems.append("completed_date set on an open task")
+        elif completed_day and day and completed_day < day:
+            problems.append("completed_date before date")
+        if problems:
+            errors.append(f"row {n}: {', '.join(problems)}")
+            continue
+
+        rows.append({
+            "user": user,
+            "task": task,
+            "points": points,
+            "status": status,
+            "date": day,
+            "completed_date": (completed_day or day) if status else None,
+            "category": category,
+            "deadline_category": deadline,
+        })
+    return rows, errors
+
+
+def insert_tasks(client, rows, chunk_size=CHUNK_SIZE):
+    inserted = []
+    for start in range(0, len(rows), chunk_size):
+        try:
+            inserted += client.table("tasks").insert(rows[start:start + chunk_size]).execute().data
+        except Exception as exc:
+            raise PartialInsertError(inserted, exc) from exc
+    return inserted
+
+
+def export_tasks(client, path, page_size=PAGE_SIZE):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()), ("user", pa.string()), ("task", pa.string()), ("points", pa.int64()),
+        ("status", pa.bool_()), ("date", pa.date32()), ("completed_date", pa.date32()),
+        ("category", pa.string()), ("deadline_category", pa.string()),
+    ])
+    columns = ", ".join(schema.names)
+    exported, after_id = 0, 0
+    with pq.ParquetWriter(path, schema) as writer:
+        while True:
+            page = client.table("tasks").select(columns).gt("id", after_id).order("id").limit(page_size).execute().data
+            if not page:
+                break
+            for row in page:
+                for key in ("date", "completed_date"):
+                    row[key] = date.fromisoformat(row[key][:10]) if row[key] else None
+            writer.write_table(pa.Table.from_pylist(page, schema=schema))
+            exported += len(page)
+            after_id = page[-1]["id"]
+    return exported
+
+
+def main(argv=None):
+    from jobs.config import load_config
+    from jobs.db import connect_supabase
+
+    parser = argparse.ArgumentParser(description="Bulk import/export for the tasks table")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import", help="insert tasks from a .csv, .jsonl or .parquet file")
+    importer.add_argument("file")
+    importer.add_argument("--user", help="owner for rows without a user column")
+    importer.add_argument("--dry-run", action="store_true", help="validate only")
+    exporter = commands.add_parser("export", help="write the whole tasks table to a Parquet file")
+    exporter.add_argument("file")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        print(f"Exported {export_tasks(connect_supabase(load_config()), args.file)} tasks to {args.file}")
+        return 0
+
+    rows, errors = validate_tasks(read_tasks_file(args.file), default_user=args.user)
+    for error in errors:
+        print(error)
+    if args.dry_run:
+        print(f"{len(rows)} valid rows, {len(errors)} rejected")
+        return 1 if errors else 0
+    try:
+        inserted = insert_tasks(connect_supabase(load_config()), rows)
+    except PartialInsertError as exc:
+        print(f"Import stopped: {exc}")
+        return 1
+    print(f"Inserted {len(inserted)} tasks, {len(errors)} rows rejected")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+# clients.py
+# Process-wide Supabase and SMTP clients for the Streamlit app. Nothing is
+# imported or connected at import time: each client is created on first use,
+# cached with st.cache_resource and shared by every session.
+
+import smtplib
+import threading
+import time
+
+import streamlit as st
+
+
+@st.cache_resource
+def get_supabase():
+    from supabase import create_client
+    return create_client(st.secrets["SUPABASE_URL"], st.secrets["SUPABASE_KEY"])
+
+
+@st.cache_resource
+def get_smtp():
+    return ReconnectingSMTP(st.secrets["SENDER_EMAIL"], st.secrets["APP_PASSWORD"])
+
+
+class ReconnectingSMTP:
+    # One yagmail connection shared across sessions. It is dropped after
+    # idle_timeout (Gmail closes idle connections well before that would fail
+    # loudly) and transparently reopened when the server hung up anyway.
+    def __init__(self, user, password, idle_timeout=240):
+        self.user = user
+        self.password = password
+        self.idle_timeout = idle_timeout
+        self._smtp = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def send(self, to, subject, contents):
+        with self._lock:
+            if self._smtp is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                self._reset()
+            for attempt in range(2):
+                try:
+                    if self._smtp is None:
+                        import yagmail
+                        self._smtp = yagmail.SMTP(self.user, self.password)
+                    self._smtp.send(to=to, subject=subject, contents=contents)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    self._reset()
+                    if attempt:
+                        raise
+            self._last_used = time.monotonic()
+
+    def close(self):
+        # Shared by every session, so a finished batch must not close it;
+        # idle connections are dropped on the next send instead.
+        pass
+
+    def _reset(self):
+        smtp, self._smtp = self._smtp, None
+        try:
+            smtp.close()
+        except Exception:
+            pass
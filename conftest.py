@@ -0,0 +1 @@
+# Repo root on sys.path, so plain `pytest` finds the top-level modules like `python -m pytest` does
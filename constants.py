@@ -0,0 +1,28 @@
+# constants.py
+# Task categories and deadlines, shared by the app and the bulk import/export tool.
+
+from datetime import time
+
+CATEGORY_COLORS = {
+    "Work": "#4a90e2",
+    "Personal": "#f39c12",
+    "Health": "#27ae60",
+    "Learning": "#8e44ad",
+    "Other": "#95a5a6"
+}
+
+DEADLINE_CATEGORIES = [
+    "⏳ No Deadline",
+    "⏰ Morning",
+    "🌤️ Afternoon",
+    "🌇 Evening",
+    "🌌 End of Day"
+]
+
+DEADLINE_TIMES = {
+    "⏰ Morning": time(10, 0),
+    "🌤️ Afternoon": time(14, 0),
+    "🌇 Evening": time(18, 0),
+    "🌌 End of Day": time(23, 59),
+    "⏳ No Deadline": None
+}
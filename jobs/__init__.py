@@ -0,0 +1,3 @@
+# Batch jobs (nightly summary, daily reminder, outbox drainer) run from cron.
+# This package must stay importable without streamlit/pandas; see
+# jobs/requirements.txt and jobs/bench_startup.py.
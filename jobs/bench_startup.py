@@ -0,0 +1,73 @@
+# jobs/bench_startup.py
+# Import-time benchmark for the cron jobs, based on `python -X importtime`.
+# Imports each job module in a fresh interpreter, reports which packages its
+# import time goes to, and fails if the job pulls in an app-only heavyweight
+# (streamlit, pandas, ...) or its total import time goes over the budget.
+#
+# The Streamlit app is a target too ("app"): its cold start is the import of
+# app.py, which must not open any client. It may use the heavyweights, so it
+# is only held to the budget.
+#
+#   python -m jobs.bench_startup                      # all jobs
+#   python -m jobs.bench_startup jobs.daily_reminder --budget-ms 1500
+#   python -m jobs.bench_startup app --budget-ms 3000 --repeat 3
+
+import argparse
+import re
+import subprocess
+import sys
+
+JOBS = ["jobs.nightly_summary", "jobs.daily_reminder", "jobs.drain_outbox"]
+FORBIDDEN = {"streamlit", "pandas", "numpy", "matplotlib", "cv2", "altair"}
+APP = "app"
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(module):
+    # Returns (total cumulative us, {top-level package: self us within the job's
+    # own import tree}, all module names). Self times add up without double
+    # counting, so the packages say where the job's import time actually goes.
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    packages, names, total, subtree = {}, set(), 0, []
+    for match in LINE.finditer(proc.stderr):
+        own, cumulative, indent, name = int(match.group(1)), int(match.group(2)), len(match.group(3)), match.group(4)
+        names.add(name)
+        subtree.append((name, own))
+        if indent == 1:  # imported directly by the interpreter; closes the tree listed above it
+            total += cumulative
+            if name == module:
+                for child, us in subtree:
+                    root = child.split(".")[0]
+                    packages[root] = packages.get(root, 0) + us
+            subtree = []
+    return total, packages, names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time benchmark for the cron jobs and the app")
+    parser.add_argument("jobs", nargs="*", default=JOBS)
+    parser.add_argument("--budget-ms", type=float, default=2000.0)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=1, help="report the fastest of N imports")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for job in args.jobs:
+        total, packages, names = min((measure(job) for _ in range(args.repeat)), key=lambda run: run[0])
+        heavy = [] if job == APP else sorted(FORBIDDEN & {name.split(".")[0] for name in names})
+        status = "ok"
+        if heavy:
+            status, failed = f"FAIL: imports {', '.join(heavy)}", True
+        elif total / 1000 > args.budget_ms:
+            status, failed = f"FAIL: over {args.budget_ms:.0f} ms budget", True
+        print(f"{job}: {total / 1000:.1f} ms ({status})")
+        for name, us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# jobs/config.py
+# Settings for the batch jobs: environment variables first, then an optional
+# Streamlit-style secrets file, so the jobs run the same in GitHub Actions and
+# on a machine that already has .streamlit/secrets.toml.
+
+import os
+from dataclasses import dataclass
+
+SECRETS_FILE = os.getenv("TASK_TRACKER_SECRETS", os.path.join(".streamlit", "secrets.toml"))
+
+
+@dataclass(frozen=True)
+class Config:
+    supabase_url: str
+    supabase_key: str
+    sender_email: str
+    email_pass: str
+    mail_workers: int = 4
+    mail_retries: int = 3
+    mail_rate: float = 5.0  # messages per second, match the SMTP provider's quota
+
+
+def _read_secrets(path):
+    if not os.path.exists(path):
+        return {}
+    import tomllib
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def load_config():
+    secrets = _read_secrets(SECRETS_FILE)
+
+    def setting(*names, default=None):
+        for name in names:
+            value = os.getenv(name) or secrets.get(name)
+            if value:
+                return value
+        return default
+
+    return Config(
+        supabase_url=setting("SUPABASE_URL"),
+        supabase_key=setting("SUPABASE_KEY"),
+        sender_email=setting("SENDER_EMAIL"),
+        # The cron secrets call it EMAIL_PASS, the app's secrets.toml APP_PASSWORD
+        email_pass=setting("EMAIL_PASS", "APP_PASSWORD"),
+        mail_workers=int(setting("MAIL_WORKERS", default=4)),
+        mail_retries=int(setting("MAIL_RETRIES", default=3)),
+        mail_rate=float(setting("MAIL_RATE", default=5.0)),
+    )
@@ -1,19 +1,14 @@
-# send_daily_task_reminder.py
-import yagmail
-from datetime import datetime
-from supabase import create_client
+# jobs/daily_reminder.py
+# Reminds users who haven't added a task today. Run with: python -m jobs.daily_reminder
 import os
-import streamlit as st
 import random
+from datetime import datetime
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-# SUPABASE_URL = st.secrets["SUPABASE_URL"]
-# SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-
+from jobs.config import load_config
+from jobs.db import PAGE_SIZE, connect_supabase, smtp_factory
+from jobs.mailer import DeliveryEngine, Journal, Message
+from jobs.metrics import JobMetrics, mask_email
 
-import random
 TONE_GROUPS = {
     "motivational" : [
     # 🔥 Motivational / Uplifting
@@ -249,32 +244,55 @@ def build_message(name):
 
 
 
-def get_users():
-    users = supabase.table("users").select("*").execute().data
-    return users or []
+def iter_users_without_tasks(supabase, day):
+    # Streams the users with no task dated `day`, one keyset page at a time,
+    # from the users_without_tasks RPC (sql/users_without_tasks.sql).
+    after_id = 0
+    while True:
+        page = supabase.rpc("users_without_tasks", {"day": day, "after_id": after_id, "page_size": PAGE_SIZE}).execute().data
+        yield from page
+        if len(page) < PAGE_SIZE:
+            return
+        after_id = page[-1]["id"]
 
-def get_today_tasks():
-    today = datetime.now().strftime("%Y-%m-%d")
-    tasks = supabase.table("tasks").select("user").eq("date", today).execute().data
-    return set(task["user"] for task in tasks)
+def iter_reminders(supabase, day, metrics):
+    # Pulled by the delivery engine as it submits, so fetching, rendering and
+    # sending overlap; each pull is timed under its own phase.
+    users = iter_users_without_tasks(supabase, day)
+    while True:
+        with metrics.phase("db"):
+            user = next(users, None)
+        if user is None:
+            return
+        with metrics.phase("render"):
+            message = Message(to=user["mail"], subject="⏰ Daily Task Reminder", contents=[build_message(user["user"])])
+        metrics.count("rendered")
+        yield message
 
-def send_reminders():
-    today_users = get_today_tasks()
-    print(f"Users with tasks today: {today_users}")
-    all_users = get_users()
-    print(f"All users: {all_users}")
-    yag = yagmail.SMTP(user=os.getenv("SENDER_EMAIL"), password=os.getenv("EMAIL_PASS"))
-    # yag = yagmail.SMTP(user=st.secrets["SENDER_EMAIL"], password=st.secrets["APP_PASSWORD"])
-    for user in all_users:
-        name, email = user["user"], user["mail"]
-        if name not in today_users:
-            html_message = build_message(name)
-            yag.send(
-            to=email,
-            subject="⏰ Daily Task Reminder",
-            contents=[html_message]
-        )
-        print(f"Sent reminder to {name} ({email})")
+def send_reminders(config, metrics=None):
+    metrics = metrics or JobMetrics("daily_reminder")
+    with metrics.phase("db"):
+        supabase = connect_supabase(config)
+    today = datetime.now().strftime("%Y-%m-%d")
+    engine = DeliveryEngine(
+        connect=smtp_factory(config),
+        workers=config.mail_workers,
+        retries=config.mail_retries,
+        rate=config.mail_rate,
+        # A rerun on the same day picks up the journal and skips whoever already got mail
+        journal=Journal(os.getenv("REMINDER_JOURNAL", f"reminder-journal-{today}.log")),
+    )
+    with metrics.phase("smtp"):
+        report = engine.send_all(iter_reminders(supabase, today, metrics))
+    metrics.record_delivery(report)
+    return report
 
 if __name__ == "__main__":
-    send_reminders()
+    metrics = JobMetrics("daily_reminder")
+    report = send_reminders(load_config(), metrics)
+    print(f"Daily task reminder: {report.summary()}")
+    for email, error in report.errors.items():
+        print(f"Failed to send to {mask_email(email)}: {error}")
+    metrics.emit()
+    if report.failed:
+        raise SystemExit(1)
@@ -0,0 +1,29 @@
+# jobs/db.py
+# Supabase and SMTP plumbing shared by the jobs. Clients are only created when
+# a job runs, never at import time.
+
+import yagmail
+from supabase import create_client
+
+PAGE_SIZE = 1000  # PostgREST caps a single response at 1000 rows by default
+
+
+def connect_supabase(config):
+    return create_client(config.supabase_url, config.supabase_key)
+
+
+def smtp_factory(config):
+    return lambda: yagmail.SMTP(user=config.sender_email, password=config.email_pass)
+
+
+def fetch_all(query):
+    # `query` is a zero-argument callable returning a fresh select builder:
+    # postgrest builders mutate in place, so one can't be re-paged. Pages are
+    # keyed on id (keyset), which the select must include.
+    rows, after_id = [], 0
+    while True:
+        page = query().gt("id", after_id).order("id").limit(PAGE_SIZE).execute().data
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        after_id = page[-1]["id"]
@@ -0,0 +1,10 @@
+# jobs/drain_outbox.py
+# Sends whatever is still pending in the email outbox. Run with: python -m jobs.drain_outbox
+from jobs.config import load_config
+from jobs.db import connect_supabase, smtp_factory
+from outbox import drain_outbox
+
+if __name__ == "__main__":
+    config = load_config()
+    report = drain_outbox(connect_supabase(config), smtp_factory(config), limit=1000)
+    print(f"Email outbox: {report.summary()}")
@@ -0,0 +1,178 @@
+# jobs/mailer.py
+# Delivers a batch of emails through a bounded pool of worker threads. Each
+# worker keeps its own authenticated SMTP connection for the whole run, a failed
+# send is retried with exponential backoff on a fresh connection, and the run
+# ends with a DeliveryReport of sent/failed counts and per-message latencies.
+#
+# `connect` is any zero-argument callable returning an object with yagmail's
+# send(to=, subject=, contents=) and close(), so a local SMTP stand-in (e.g.
+# aiosmtpd) can be used by passing yagmail.SMTP(host=..., port=..., ...).
+#
+# Optionally every send attempt first takes a token from a TokenBucket, to stay
+# inside the SMTP provider's quota, and every delivery is appended to a Journal
+# so that rerunning a crashed batch skips recipients that already got mail.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from jobs.metrics import percentile
+
+
+@dataclass
+class Message:
+    to: str
+    subject: str
+    contents: object
+
+
+@dataclass
+class DeliveryReport:
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0  # already delivered according to the journal
+    latencies: list = field(default_factory=list)  # seconds, successful sends only
+    errors: dict = field(default_factory=dict)      # recipient -> last error
+
+    def percentile(self, pct):
+        return percentile(self.latencies, pct)
+
+    def summary(self):
+        return (f"sent={self.sent} failed={self.failed} skipped={self.skipped} "
+                f"p50={self.percentile(50):.2f}s p95={self.percentile(95):.2f}s "
+                f"max={max(self.latencies, default=0.0):.2f}s")
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = rate  # tokens per second
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Journal:
+    # Append-only file of delivered recipients, one per line.
+    def __init__(self, path):
+        self.path = path
+        self.delivered = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.delivered = {line.strip() for line in f if line.strip()}
+        self._lock = threading.Lock()
+
+    def record(self, recipient):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(recipient + "\n")
+            self.delivered.add(recipient)
+
+
+class DeliveryEngine:
+    def __init__(self, connect, workers=4, retries=3, backoff=1.0, rate=None, journal=None):
+        self.connect = connect
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.bucket = TokenBucket(rate, burst=workers) if rate else None
+        self.journal = journal
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def send_all(self, messages):
+        # `messages` is consumed lazily: at most 2 * workers messages are in
+        # flight, so a streaming source (paged fetch + render) stays a stream
+        # and memory doesn't grow with the batch size. Results are folded into
+        # the report as each send completes.
+        report = DeliveryReport()
+        slots = threading.Semaphore(2 * self.workers)
+        lock = threading.Lock()
+
+        def done(future, to):
+            try:
+                latency = future.result()
+            except Exception as exc:
+                with lock:
+                    report.failed += 1
+                    report.errors[to] = repr(exc)
+            else:
+                with lock:
+                    report.sent += 1
+                    report.latencies.append(latency)
+            finally:
+                slots.release()
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for message in messages:
+                    if self.journal is not None and message.to in self.journal.delivered:
+                        report.skipped += 1
+                        continue
+                    slots.acquire()
+                    future = pool.submit(self._deliver, message)
+                    future.add_done_callback(lambda future, to=message.to: done(future, to))
+        finally:
+            self._close_all()
+        return report
+
+    def _deliver(self, message):
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            if self.bucket is not None:
+                self.bucket.acquire()
+            try:
+                self._connection().send(to=message.to, subject=message.subject, contents=message.contents)
+            except Exception:
+                self._drop_connection()
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+            else:
+                if self.journal is not None:
+                    self.journal.record(message.to)
+                return time.perf_counter() - start
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self.connect()
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            with self._lock:
+                self._connections.remove(conn)
+            _close_quietly(conn)
+
+    def _close_all(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            _close_quietly(conn)
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
@@ -0,0 +1,91 @@
+# jobs/metrics.py
+# Run metrics for the cron jobs: per-phase timing (db / render / smtp),
+# counters and per-recipient latency percentiles, emitted at the end of a run
+# as one JSON line on stdout, prefixed with "METRICS ", and appended to
+# $JOB_METRICS_FILE when set, so runs can be compared as the user count grows.
+#
+# Phases record exclusive time: entering a phase pauses the one around it, so
+# the streaming reminder job (which fetches and renders while the SMTP workers
+# are already sending) still splits its wall time between the three.
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(samples, q):
+    # Nearest rank on the sorted samples; the one rule shared by the jobs'
+    # delivery latencies and the app timings (perf.py)
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def mask_email(address):
+    # Keeps failures traceable in the job log without printing the address
+    name, _, domain = str(address).partition("@")
+    return f"{name[:1]}***@{domain}" if domain else "***"
+
+
+class JobMetrics:
+    def __init__(self, job):
+        self.job = job
+        self.started_at = datetime.now(timezone.utc)
+        self.phases = {}    # name -> seconds
+        self.counters = {}  # name -> count
+        self.latencies = []
+        self._started = time.perf_counter()
+        self._stack = []    # [phase name, running since] of the open phases
+
+    @contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            self._add(self._stack[-1][0], now - self._stack[-1][1])
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._add(name, now - self._stack.pop()[1])
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_delivery(self, report):
+        # Folds in a jobs.mailer.DeliveryReport
+        self.count("sent", report.sent)
+        self.count("failed", report.failed)
+        self.count("skipped", report.skipped)
+        self.latencies += report.latencies
+
+    def summary(self):
+        latency = {f"p{pct}": round(percentile(self.latencies, pct), 4) for pct in PERCENTILES}
+        latency["max"] = round(max(self.latencies, default=0.0), 4)
+        return {
+            "job": self.job,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "duration_s": round(time.perf_counter() - self._started, 3),
+            "phases_s": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+            "latency_s": latency,
+        }
+
+    def emit(self):
+        line = json.dumps(self.summary(), sort_keys=True)
+        print(f"METRICS {line}")
+        path = os.getenv("JOB_METRICS_FILE")
+        if path:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        return line
+
+    def _add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
@@ -0,0 +1,54 @@
+# jobs/nightly_summary.py
+# Emails every user a summary of today's tasks. Run with: python -m jobs.nightly_summary
+from datetime import datetime
+from collections import defaultdict
+
+from jobs.config import load_config
+from jobs.db import connect_supabase, fetch_all, smtp_factory
+from jobs.mailer import DeliveryEngine, Message
+from jobs.metrics import JobMetrics, mask_email
+from jobs.summary_email import render_summaries
+
+def get_today_tasks_by_user(supabase, today):
+    # One bulk read of today's tasks, grouped in memory, instead of a query per user
+    tasks_by_user = defaultdict(list)
+    for task in fetch_all(lambda: supabase.table("tasks").select("id, user, task, status, date").eq("date", today)):
+        tasks_by_user[task["user"]].append(task)
+    return tasks_by_user
+
+def send_nightly_summary(config, metrics=None):
+    metrics = metrics or JobMetrics("nightly_summary")
+    today = datetime.today().strftime("%Y-%m-%d")
+    with metrics.phase("db"):
+        supabase = connect_supabase(config)
+        users = fetch_all(lambda: supabase.table("users").select("id, user, mail"))
+        tasks_by_user = get_today_tasks_by_user(supabase, today)
+    metrics.count("users", len(users))
+    metrics.count("tasks", sum(len(tasks) for tasks in tasks_by_user.values()))
+    subject = "🌙 Your Daily Task Summary"
+    with metrics.phase("render"):
+        messages = [
+            Message(to=user["mail"], subject=subject, contents=html)
+            for user, html in render_summaries(users, tasks_by_user)
+        ]
+    metrics.count("rendered", len(messages))
+
+    engine = DeliveryEngine(
+        connect=smtp_factory(config),
+        workers=config.mail_workers,
+        retries=config.mail_retries,
+    )
+    with metrics.phase("smtp"):
+        report = engine.send_all(messages)
+    metrics.record_delivery(report)
+    return report
+
+if __name__ == "__main__":
+    metrics = JobMetrics("nightly_summary")
+    report = send_nightly_summary(load_config(), metrics)
+    print(f"Nightly task summary: {report.summary()}")
+    for email, error in report.errors.items():
+        print(f"Failed to send to {mask_email(email)}: {error}")
+    metrics.emit()
+    if report.failed:
+        raise SystemExit(1)
@@ -1,25 +1,10 @@
-import os
-import random
-import yagmail
-from supabase import create_client
-from datetime import datetime
-from jinja2 import Template
-import streamlit as st
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-EMAIL_USER = os.getenv("SENDER_EMAIL")
-EMAIL_PASS = os.getenv("EMAIL_PASS")
-
-# SUPABASE_URL = st.secrets["SUPABASE_URL"]
-# SUPABASE_KEY = st.secrets["SUPABASE_KEY"]
-# EMAIL_USER = st.secrets["SENDER_EMAIL"]
-# EMAIL_PASS = st.secrets["APP_PASSWORD"]
-
+# jobs/summary_email.py
+# Renders the nightly summary emails. Both templates are compiled once into a
+# shared Environment (with an on-disk bytecode cache) instead of being parsed
+# from source for every user.
 
-
-yag = yagmail.SMTP(user=EMAIL_USER, password=EMAIL_PASS)
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+import random
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
 
 # Section 1: Quotes for Task Completion Status
 
@@ -231,36 +216,26 @@ CONGRATS_TEMPLATE = """
 </html>
 """
 
-def generate_task_summary_email_html(name, tasks, completed_tasks):
-    complete_quote = random.choice(COMPLETED_TASKS_QUOTES)
-    pending_quote = random.choice(PENDING_TASKS_QUOTES)
-
-    all_completed = len(tasks) == len(completed_tasks)
-    completed = [task['task'] for task in completed_tasks]
-
-    if all_completed:
-        template = Template(CONGRATS_TEMPLATE)
-        return template.render(name=name, quote=complete_quote, completed_tasks=completed)
-    else:
-        pending = [task['task'] for task in tasks if task not in completed_tasks]
-        template = Template(PARTIAL_TEMPLATE)
-        return template.render(name=name, completed_tasks=completed, pending_tasks=pending, quote=pending_quote)
-
-def send_nightly_summary():
-    users = supabase.table("users").select("user, mail").execute().data
-    for user in users:
-        name = user["user"]
-        email = user["mail"]
-
-        today = datetime.today().strftime("%Y-%m-%d")
-        tasks = supabase.table("tasks").select("task, status, date").eq("user", name).eq("date", today).execute().data
-        completed = [task for task in tasks if task['status']]
-
-        html = generate_task_summary_email_html(name, tasks, completed)
-        subject = "🌙 Your Daily Task Summary"
-
-        yag.send(to=email, subject=subject, contents=html)
-
-if __name__ == "__main__":
-    send_nightly_summary()
-    print("Nightly task summary emails sent successfully!")
\ No newline at end of file
+env = Environment(
+    loader=DictLoader({"partial.html": PARTIAL_TEMPLATE, "congrats.html": CONGRATS_TEMPLATE}),
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+
+def partition_tasks(tasks):
+    # Single pass over the day's tasks into (completed, pending) task names
+    completed, pending = [], []
+    for task in tasks:
+        (completed if task['status'] else pending).append(task['task'])
+    return completed, pending
+
+def render_summary(name, tasks):
+    completed, pending = partition_tasks(tasks)
+    if not pending:
+        return env.get_template("congrats.html").render(
+            name=name, quote=random.choice(COMPLETED_TASKS_QUOTES), completed_tasks=completed)
+    return env.get_template("partial.html").render(
+        name=name, completed_tasks=completed, pending_tasks=pending, quote=random.choice(PENDING_TASKS_QUOTES))
+
+def render_summaries(users, tasks_by_user):
+    # Renders a whole batch: one (user, html) pair per user, in order
+    return [(user, render_summary(user["user"], tasks_by_user.get(user["user"], []))) for user in users]
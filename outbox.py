@@ -0,0 +1,80 @@
+# outbox.py
+# Emails that must not hold up a Streamlit request are queued in the
+# email_outbox table (sql/email_outbox.sql) and sent here. The app drains the
+# outbox on a background thread right after queueing; jobs/drain_outbox.py
+# drains whatever is left (e.g. after an SMTP outage) from cron.
+
+from datetime import datetime, timedelta, timezone
+
+from jobs.mailer import DeliveryEngine, Message
+
+MAX_ATTEMPTS = 5
+CLAIM_TIMEOUT = timedelta(minutes=10)  # a "sending" row older than this is assumed abandoned
+
+
+def welcome_email(name):
+    subject = f"Welcome to Task Tracker, {name}! 🎉"
+    body = f"""
+    <html>
+        <body style="font-family: Arial, sans-serif; color: #333; line-height: 1.6; background-color: #f9f9f9; padding: 20px;">
+            <div style="max-width: 600px; margin: auto; background: #fff; border-radius: 10px; padding: 30px; box-shadow: 0 2px 8px rgba(0,0,0,0.05);">
+                <h2 style="color: #4CAF50;">Welcome aboard, {name}! 🚀</h2>
+                
+                <p style="font-size: 18px;">You're all set to crush tasks and track wins.</p>
+                
+                <hr style="border: none; border-top: 1px solid #eee; margin: 20px 0;">
+                
+                <ul style="padding-left: 20px;">
+                    <li>✨ Add tasks in seconds</li>
+                    <li>🎯 Stay focused daily</li>
+                    <li>🏆 Earn points & celebrate wins</li>
+                </ul>
+                
+                <p style="margin-top: 30px;">Let’s make productivity fun.</p>
+
+                <blockquote style="font-style: italic; color: #777; margin-top: 30px;">
+                    “Success is the sum of small efforts, repeated day in and day out.” – Robert Collier
+                </blockquote>
+
+                <p style="color: #888; font-size: 14px; margin-top: 40px;">– Team S.A.R.A 💡</p>
+            </div>
+        </body>
+    </html>
+    """
+    return subject, body
+
+
+TEMPLATES = {"welcome": welcome_email}
+
+
+def drain_outbox(client, connect, limit=100):
+    now = datetime.now(timezone.utc)
+    claimable = f"status.eq.pending,and(status.eq.sending,claimed_at.lt.{(now - CLAIM_TIMEOUT).isoformat()})"
+    rows = client.table("email_outbox").select("id, kind, to_email, name, attempts").or_(
+        claimable).lt("attempts", MAX_ATTEMPTS).order("id").limit(limit).execute().data
+
+    # Claim each row before sending so a concurrent drainer can't send it twice
+    claimed = []
+    for row in rows:
+        if client.table("email_outbox").update({"status": "sending", "claimed_at": now.isoformat()}).eq(
+                "id", row["id"]).or_(claimable).execute().data:
+            claimed.append(row)
+
+    messages = [Message(row["to_email"], *TEMPLATES[row["kind"]](row["name"])) for row in claimed]
+    report = DeliveryEngine(connect, workers=2, retries=2).send_all(messages)
+
+    # Each row is recorded on its own: a failed update leaves only that row
+    # "sending" (resent after CLAIM_TIMEOUT), not every row after it.
+    for row in claimed:
+        error = report.errors.get(row["to_email"])
+        if error is None:
+            update = {"status": "sent", "sent_at": datetime.now(timezone.utc).isoformat()}
+        else:
+            attempts = row["attempts"] + 1
+            update = {"status": "pending" if attempts < MAX_ATTEMPTS else "failed",
+                      "attempts": attempts, "last_error": error}
+        try:
+            client.table("email_outbox").update(update).eq("id", row["id"]).execute()
+        except Exception as exc:
+            print(f"Email outbox: could not mark row {row['id']} {update['status']}: {exc!r}")
+    return report
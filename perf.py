@@ -0,0 +1,78 @@
+# perf.py
+# Timing spans for the dashboard hot paths. Each span name keeps a rolling
+# window of its most recent durations (a bounded deque, so memory stays flat
+# however long the server runs) from which the admin "Performance" panel reads
+# count / last / p50 / p95 / max.
+#
+# With a log path set, every span is also appended as one JSON line
+# ({"ts": ..., "span": ..., "ms": ...}) for offline analysis.
+
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from jobs.metrics import percentile
+
+WINDOW = 500  # samples kept per span
+
+
+class PerfRecorder:
+    def __init__(self, window=WINDOW, log_path=None):
+        self.window = window
+        self._samples = {}  # span name -> deque of {"ts", "span", "ms"} records
+        self._lock = threading.Lock()
+        self._log = open(log_path, "a", encoding="utf-8", buffering=1) if log_path else None
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, ms):
+        sample = {"ts": round(time.time(), 3), "span": name, "ms": round(ms, 3)}
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(sample)
+            if self._log is not None:
+                self._log.write(json.dumps(sample) + "\n")
+
+    def summary(self):
+        # One row per span, slowest p95 first
+        with self._lock:
+            samples = {name: [sample["ms"] for sample in values] for name, values in self._samples.items()}
+        rows = [{
+            "span": name,
+            "count": len(values),
+            "last_ms": round(values[-1], 1),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "max_ms": round(max(values), 1),
+        } for name, values in samples.items()]
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def export_jsonl(self):
+        # The samples currently held, oldest first, in the TASK_PERF_LOG format
+        with self._lock:
+            samples = [sample for values in self._samples.values() for sample in values]
+        return "".join(json.dumps(sample) + "\n" for sample in sorted(samples, key=lambda sample: sample["ts"]))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
@@ -0,0 +1,29 @@
+-- Outbox for emails that must not be sent on the request path. A row is
+-- written in the same transaction as the change that triggers the email and
+-- is sent later by outbox.drain_outbox.
+
+create table if not exists email_outbox (
+  id bigint generated always as identity primary key,
+  kind text not null,                      -- which template, e.g. 'welcome'
+  to_email text not null,
+  name text not null,
+  status text not null default 'pending',  -- pending | sending | sent | failed
+  attempts int not null default 0,
+  last_error text,
+  created_at timestamptz not null default now(),
+  claimed_at timestamptz,
+  sent_at timestamptz
+);
+
+create index if not exists email_outbox_unsent_idx on email_outbox (id) where status in ('pending', 'sending');
+
+-- Creates the user and queues their welcome email atomically.
+create or replace function create_user_with_welcome(user_name text, user_mail text)
+returns setof users
+language plpgsql
+as $$
+begin
+  insert into email_outbox (kind, to_email, name) values ('welcome', user_mail, user_name);
+  return query insert into users ("user", mail, created_at) values (user_name, user_mail, now()) returning *;
+end;
+$$;
@@ -0,0 +1,58 @@
+-- Points over completed tasks for the leaderboard and the progress charts
+-- (task_stats.py). Summed in the database so the app receives one row per
+-- user, or per user and period, instead of the completed-task history.
+--
+-- user_filter / category_filter mirror the dashboard selection; null = all.
+-- points_per_period buckets by ISO week (starting Monday) or calendar month.
+--
+-- Both are keyset-paged like users_without_tasks: PostgREST returns at most
+-- 1000 rows per call, and a year of weekly totals for 100 users is already
+-- ~5,000. Call with the after_* keys null, then with the sort key of the last
+-- row of each page until a page comes back shorter than page_size.
+
+create index if not exists tasks_completed_idx on tasks (completed_date, "user") where status;
+
+-- The paging parameters changed the signatures; drop the old overloads so
+-- calls by name stay unambiguous.
+drop function if exists points_per_user(text, text);
+drop function if exists points_per_period(text, text, text);
+
+create or replace function points_per_user(user_filter text default null, category_filter text default null,
+                                           after_user text default null, page_size int default 1000)
+returns table ("user" text, points bigint)
+language sql stable
+as $$
+  select t."user"::text, sum(t.points)::bigint
+  from tasks t
+  where t.status
+    and (user_filter is null or t."user" = user_filter)
+    and (category_filter is null or t.category = category_filter)
+    and (after_user is null or t."user" > after_user)
+  group by t."user"
+  order by 1
+  limit page_size
+$$;
+
+create or replace function points_per_period(period text, user_filter text default null, category_filter text default null,
+                                             after_user text default null, after_period date default null,
+                                             page_size int default 1000)
+returns table ("user" text, period_start date, points bigint)
+language sql stable
+as $$
+  select totals.*
+  from (
+    select t."user"::text as "user", date_trunc(period, t.completed_date)::date as period_start,
+           sum(t.points)::bigint as points
+    from tasks t
+    where t.status
+      and t.completed_date is not null
+      and period in ('week', 'month')
+      and (user_filter is null or t."user" = user_filter)
+      and (category_filter is null or t.category = category_filter)
+      and (after_user is null or t."user" >= after_user)
+    group by 1, 2
+  ) totals
+  where after_user is null or (totals."user", totals.period_start) > (after_user, after_period)
+  order by 1, 2
+  limit page_size
+$$;
@@ -0,0 +1,22 @@
+-- Users that have not added a task for the given day, i.e. the recipients of
+-- the daily reminder. Anti-join done in the database so the reminder job only
+-- receives (id, user, mail) for the users it actually has to email.
+--
+-- Keyset-paged: call with after_id = 0, then with the last id of each page
+-- until a page comes back shorter than page_size.
+
+create index if not exists tasks_date_user_idx on tasks (date, "user");
+
+create or replace function users_without_tasks(day date, after_id bigint default 0, page_size int default 1000)
+returns table (id bigint, "user" text, mail text)
+language sql stable
+as $$
+  select u.id::bigint, u."user"::text, u.mail::text
+  from users u
+  where u.id > after_id
+    and not exists (
+      select 1 from tasks t where t."user" = u."user" and t.date = day
+    )
+  order by u.id
+  limit page_size
+$$;
@@ -0,0 +1,127 @@
+# task_feed.py
+# Row-level change feed for the tasks table. Subscribers are called with a list
+# of changed rows (full records, inserts and updates). Deletes are not pushed;
+# the next wholesale refetch of a view (its sync interval, or an explicit
+# resync) picks them up.
+#
+# The app's own writes are published here too, so every session sees them at
+# once. LocalFeed is a plain in-process pub/sub: it is the feed on its own when
+# realtime is off (local development, tests, benchmarks) and the fan-out for
+# SupabaseRealtimeFeed, which listens to Supabase Realtime postgres_changes on
+# a background thread. The table has to be in the supabase_realtime
+# publication for the server to send anything.
+#
+# `connected` says whether the feed currently sees changes made by other
+# processes; callers use it to decide how often they still need to poll.
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+
+RECONNECT_DELAY = 5     # seconds, doubled after each failed attempt
+MAX_RECONNECT_DELAY = 300
+HEALTH_CHECK = 15       # seconds between socket / channel checks
+ECHO_WINDOW = 1000      # own writes remembered to drop their realtime echo
+
+
+class LocalFeed:
+    def __init__(self):
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self.connected = False  # in-process only: other writers are never seen
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+        return lambda: self._unsubscribe(callback)
+
+    def _unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, rows):
+        # An empty list is passed on as well: subscribers treat it as "something
+        # changed, refetch" (e.g. an update that returned no rows).
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(rows)
+            except Exception as exc:
+                # One broken subscriber must not stop the others (or the listener thread)
+                print(f"Task feed subscriber failed: {exc!r}")
+
+
+class SupabaseRealtimeFeed(LocalFeed):
+    def __init__(self, url, key, table="tasks", schema="public"):
+        super().__init__()
+        self.url = url
+        self.key = key
+        self.table = table
+        self.schema = schema
+        self._thread = None
+        self._recent = OrderedDict()  # id -> own write, see publish()
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="task-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def publish(self, rows):
+        # Our own writes are applied right away; remember them so the same
+        # row coming back over the socket isn't applied a second time.
+        with self._lock:
+            for row in rows:
+                self._recent[row["id"]] = row
+                self._recent.move_to_end(row["id"])
+            while len(self._recent) > ECHO_WINDOW:
+                self._recent.popitem(last=False)
+        super().publish(rows)
+
+    def _run(self):
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                asyncio.run(self._listen())
+            except Exception as exc:
+                if self.connected:
+                    delay = RECONNECT_DELAY  # it was up, so this is a fresh outage
+                print(f"Task feed disconnected: {exc!r}, reconnecting in {delay}s")
+            self.connected = False
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _listen(self):
+        # The realtime client is async-only, so it gets its own event loop here
+        from supabase import acreate_client
+
+        client = await acreate_client(self.url, self.key)
+        channel = client.channel(f"{self.table}-changes")
+        for event in ("INSERT", "UPDATE"):
+            channel.on_postgres_changes(event, schema=self.schema, table=self.table, callback=self._on_change)
+        await channel.subscribe()
+        try:
+            # A socket can die without an error reaching us; check it and the
+            # channel ourselves so `connected` never claims a dead feed.
+            while True:
+                await asyncio.sleep(HEALTH_CHECK)  # the first pass also gives the join time to land
+                if not (client.realtime.is_connected and channel.is_joined):
+                    raise ConnectionError("realtime socket or channel is down")
+                self.connected = True
+        finally:
+            await client.remove_all_channels()
+
+    def _on_change(self, payload):
+        # Older realtime clients pass the record at the top level, newer ones under "data"
+        data = payload.get("data", payload)
+        record = data.get("record")
+        if not record:
+            return
+        with self._lock:
+            own = self._recent.pop(record.get("id"), None)
+        if own is not None and all(own.get(key) == value for key, value in record.items() if key in own):
+            return  # echo of a write we already applied
+        LocalFeed.publish(self, [record])
@@ -0,0 +1,104 @@
+# task_stats.py
+# Points totals for the leaderboard and progress charts, summed in the
+# database (sql/task_points.sql) so a view ships tens of aggregate rows instead
+# of the completed-task history.
+#
+# TaskStats has the same surface as a TaskSync view (get / derive / apply /
+# invalidate / version), so it lives in the same registry in the app and is
+# refreshed by the same writes and pushed rows.
+
+import threading
+import time
+
+import pandas as pd
+
+PERIODS = {"Week": "week", "Month": "month"}  # chart label -> date_trunc unit (ISO weeks)
+PAGE_SIZE = 1000  # PostgREST caps a single response at 1000 rows by default
+
+
+def fetch_pages(client, function, params, keys):
+    # Keyset-pages one of the points RPCs: `keys` maps the columns it sorts by
+    # to the after_* parameters that resume after the last row of a page.
+    rows, after = [], dict.fromkeys(keys.values())
+    while True:
+        page = client.rpc(function, {**params, **after, "page_size": PAGE_SIZE}).execute().data
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        after = {param: page[-1][column] for column, param in keys.items()}
+
+
+def points_by_user(client, user=None, category=None):
+    rows = fetch_pages(client, "points_per_user", {"user_filter": user, "category_filter": category},
+                       {"user": "after_user"})
+    df = pd.DataFrame(rows, columns=["user", "points"])
+    df["points"] = df["points"].astype("int64")
+    return df
+
+
+def points_by_period(client, period, user=None, category=None):
+    rows = fetch_pages(client, "points_per_period", {"period": period, "user_filter": user, "category_filter": category},
+                       {"user": "after_user", "period_start": "after_period"})
+    df = pd.DataFrame(rows, columns=["user", "period_start", "points"]).rename(columns={"period_start": "period"})
+    df["period"] = pd.to_datetime(df["period"])
+    df["points"] = df["points"].astype("int64")
+    return df
+
+
+class TaskStats:
+    def __init__(self, client, user=None, category=None, interval=60):
+        self.client = client
+        self.user = user
+        self.category = category
+        self.interval = interval
+        self.data = None       # {"user": totals, "Week": ..., "Month": ...}
+        self.version = 0
+        self._derived = {}
+        self.synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, resync=False):
+        with self._lock:
+            if resync or self.data is None or time.monotonic() - self.synced_at >= self.interval:
+                data = {"user": points_by_user(self.client, self.user, self.category)}
+                for label, period in PERIODS.items():
+                    data[label] = points_by_period(self.client, period, self.user, self.category)
+                self._replace(data)
+                self.synced_at = time.monotonic()
+            return self.data
+
+    def derive(self, name, build):
+        with self._lock:
+            version, data = self.version, self.data
+            cached = self._derived.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = build(data)
+        with self._lock:
+            self._derived[name] = (version, value)
+        return value
+
+    def invalidate(self):
+        self.synced_at = 0.0
+
+    def apply(self, rows):
+        # Aggregates can't be patched from single rows; a completed task in
+        # this selection marks the totals stale, and the version bump makes
+        # sessions showing them rerun (and refetch).
+        if not rows:
+            self.invalidate()
+            return
+        if any(row.get("status") and self.matches(row) for row in rows):
+            with self._lock:
+                self.invalidate()
+                self.version += 1
+
+    def matches(self, row):
+        return ((self.user is None or row["user"] == self.user)
+                and (self.category is None or row["category"] == self.category))
+
+    def _replace(self, data):
+        if self.data is not None and all(data[key].equals(self.data[key]) for key in data):
+            return
+        self.data = data
+        self.version += 1
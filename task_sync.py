@@ -0,0 +1,141 @@
+# task_sync.py
+# Keeps the open tasks of one filter combination (user / category) in memory,
+# shared by every session showing that view. The filters and the column
+# projection are pushed down into the Supabase query, and the frame is only
+# refetched once `interval` has passed or a write invalidated it; our own
+# writes and pushed rows (task_feed.py) are patched in directly.
+#
+# Completed tasks are never loaded here: the leaderboard and charts read
+# server-side totals (task_stats.py).
+#
+# The frames are shared read-only; app.py turns on pandas copy-on-write so a
+# session that assigns into one gets its own copy.
+
+import threading
+import time
+
+import pandas as pd
+
+# What the board reads: only open tasks, and only the columns it shows
+OPEN_COLUMNS = ["id", "user", "task", "points", "status", "category", "deadline_category"]
+
+CATEGORICAL_COLUMNS = ["user", "category", "deadline_category"]
+
+PAGE_SIZE = 1000  # PostgREST caps a single response at 1000 rows by default
+
+
+def normalize(df):
+    # Low-cardinality strings become categoricals, status bool and points
+    # (1-10) int8, so callers never re-parse them and the shared frame stays
+    # compact. An empty frame has object columns, so id is cast too.
+    if "id" in df:
+        df["id"] = df["id"].astype("int64")
+    if "status" in df:
+        df["status"] = df["status"].fillna(False).astype(bool)
+    if "points" in df:
+        df["points"] = pd.to_numeric(df["points"]).fillna(0).astype("int8")
+    for column in CATEGORICAL_COLUMNS:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    return df
+
+
+def to_frame(rows, columns=OPEN_COLUMNS):
+    return normalize(pd.DataFrame(rows, columns=columns) if rows else pd.DataFrame(columns=columns))
+
+
+def merge_rows(df, rows, columns=OPEN_COLUMNS):
+    # Upsert by id: rows we already hold are replaced by their fresh version.
+    if not rows:
+        return df
+    delta = to_frame(rows, columns)
+    kept = df[~df["id"].isin(delta["id"])]
+    return normalize(pd.concat([kept, delta], ignore_index=True).sort_values("id", ignore_index=True))
+
+
+class TaskSync:
+    def __init__(self, client, user=None, category=None, interval=60):
+        self.client = client
+        self.user = user
+        self.category = category
+        self.columns = OPEN_COLUMNS
+        self.interval = interval
+        self.df = None
+        self.version = 0       # bumped whenever the held frame changes
+        self._derived = {}     # name -> (version, value), see derive()
+        self.synced_at = 0.0   # monotonic clock of the last fetch
+        self._lock = threading.Lock()
+
+    def get(self, resync=False):
+        with self._lock:
+            # Open tasks can be edited, moved to another category or completed,
+            # and the open side is small, so a sync refetches it wholesale.
+            # Deletes are picked up the same way.
+            if resync or self.df is None or time.monotonic() - self.synced_at >= self.interval:
+                self._replace(to_frame(self._fetch(), self.columns))
+                self.synced_at = time.monotonic()
+            # Shared with every session and never modified in place (writes
+            # replace self.df), so no per-call copy; callers must not mutate it.
+            return self.df
+
+    def derive(self, name, build):
+        # Memoizes build(df) per data version, so structures derived from the
+        # view are rebuilt when the tasks change and not on every rerun.
+        # build must not mutate the frame it is given.
+        with self._lock:
+            version, df = self.version, self.df
+            cached = self._derived.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = build(df)
+        with self._lock:
+            self._derived[name] = (version, value)
+        return value
+
+    def invalidate(self):
+        # Forces the next get() to refetch regardless of the interval.
+        self.synced_at = 0.0
+
+    def apply(self, rows):
+        # Writes changed rows (our own insert/update results, or rows pushed
+        # by the change feed) straight into the held frame: a completed task
+        # drops out, a new or edited one in this selection is upserted.
+        if not rows:
+            self.invalidate()
+            return
+        with self._lock:
+            if self.df is None:
+                return
+            ids = [row["id"] for row in rows]
+            df = self.df[~self.df["id"].isin(ids)]
+            self._replace(merge_rows(df, [row for row in rows if self.matches(row)], self.columns))
+
+    def matches(self, row):
+        return ((self.user is None or row["user"] == self.user)
+                and (self.category is None or row["category"] == self.category)
+                and not row["status"])
+
+    def _fetch(self):
+        # Keyset pages by id, like jobs.db.fetch_all; _select() builds a fresh
+        # query per page since postgrest builders can't be re-paged.
+        rows, after_id = [], 0
+        while True:
+            page = self._select().gt("id", after_id).order("id").limit(PAGE_SIZE).execute().data
+            rows.extend(page)
+            if len(page) < PAGE_SIZE:
+                return rows
+            after_id = page[-1]["id"]
+
+    def _select(self):
+        query = self.client.table("tasks").select(", ".join(self.columns)).eq("status", False)
+        if self.user is not None:
+            query = query.eq("user", self.user)
+        if self.category is not None:
+            query = query.eq("category", self.category)
+        return query
+
+    def _replace(self, df):
+        if self.df is not None and df.equals(self.df):
+            return
+        self.df = df
+        self.version += 1
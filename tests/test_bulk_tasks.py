@@ -0,0 +1,78 @@
+import pandas as pd
+import pytest
+
+from bench.fake_supabase import FakeSupabase
+from bulk_tasks import PartialInsertError, insert_tasks, validate_tasks
+from constants import DEADLINE_CATEGORIES
+
+
+def row(**overrides):
+    base = {"user": "ana", "task": "Write report", "points": 3, "category": "Work",
+            "deadline_category": DEADLINE_CATEGORIES[0], "date": "2024-03-01"}
+    return {**base, **overrides}
+
+
+def validate(*records):
+    return validate_tasks(pd.DataFrame(list(records)))
+
+
+def test_valid_open_row():
+    rows, errors = validate(row())
+    assert errors == []
+    assert rows[0]["status"] is False and rows[0]["completed_date"] is None and rows[0]["date"] == "2024-03-01"
+
+
+@pytest.mark.parametrize("bad", ["2024-13-01", "yesterday", "01/03/2024"])
+def test_rejects_malformed_dates(bad):
+    rows, errors = validate(row(date=bad))
+    assert rows == [] and "date must be YYYY-MM-DD" in errors[0]
+
+
+@pytest.mark.parametrize("bad", [3.7, "2.5", "many", 11, 0])
+def test_rejects_points_that_are_not_whole_1_to_10(bad):
+    rows, errors = validate(row(points=bad))
+    assert rows == [] and "points must be a whole number 1-10" in errors[0]
+
+
+def test_whole_float_points_are_accepted():
+    rows, errors = validate(row(points=4.0), row(points="7"))
+    assert errors == [] and [r["points"] for r in rows] == [4, 7]
+
+
+def test_completed_history_is_imported_as_done():
+    rows, errors = validate(row(status="true", completed_date="2024-03-02"), row(status=1))
+    assert errors == []
+    assert [r["status"] for r in rows] == [True, True]
+    assert [r["completed_date"] for r in rows] == ["2024-03-02", "2024-03-01"]
+
+
+@pytest.mark.parametrize("overrides, problem", [
+    ({"status": "maybe"}, "status must be true/false"),
+    ({"status": False, "completed_date": "2024-03-02"}, "completed_date set on an open task"),
+    ({"status": True, "completed_date": "2024-02-01"}, "completed_date before date"),
+    ({"status": True, "completed_date": "soon"}, "completed_date must be YYYY-MM-DD"),
+])
+def test_rejects_inconsistent_status(overrides, problem):
+    rows, errors = validate(row(**overrides))
+    assert rows == [] and problem in errors[0]
+
+
+def test_partial_insert_reports_what_was_written():
+    client = FakeSupabase()
+    rows, _ = validate(*[row(task=f"t{i}") for i in range(5)])
+    original = client.table
+
+    def fail_third_chunk(rows):
+        raise ConnectionError("boom")
+
+    def table(name):
+        query = original(name)
+        if len(client.tables["tasks"]) >= 4:
+            query.insert = fail_third_chunk
+        return query
+
+    client.table = table
+    with pytest.raises(PartialInsertError) as exc:
+        insert_tasks(client, rows, chunk_size=2)
+    assert len(exc.value.inserted) == 4
+    assert isinstance(exc.value.__cause__, ConnectionError)
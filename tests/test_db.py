@@ -0,0 +1,24 @@
+import pytest
+
+from bench.fake_supabase import FakeSupabase
+from bench.synthetic import make_users
+from jobs.db import PAGE_SIZE, fetch_all
+
+
+def test_fetch_all_reads_every_page_once():
+    client = FakeSupabase(users=make_users(2 * PAGE_SIZE + 5))
+    rows = fetch_all(lambda: client.table("users").select("id, user, mail"))
+    assert [row["id"] for row in rows] == list(range(1, 2 * PAGE_SIZE + 6))
+
+
+def test_fetch_all_exact_page_multiple():
+    client = FakeSupabase(users=make_users(PAGE_SIZE))
+    assert len(fetch_all(lambda: client.table("users").select("id, user"))) == PAGE_SIZE
+
+
+def test_reused_builder_is_refused_like_postgrest():
+    query = FakeSupabase(users=make_users(10)).table("users").select("id")
+    query.range(0, 4)
+    query.range(5, 9)
+    with pytest.raises(ValueError, match="duplicate"):
+        query.execute()
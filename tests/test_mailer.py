@@ -0,0 +1,142 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from jobs import mailer
+from jobs.mailer import DeliveryEngine, Journal, Message, TokenBucket
+
+
+class StubSMTP:
+    # Records sends; `failures` is shared across connections: the next N sends fail
+    def __init__(self, state):
+        self.state = state
+        self.closed = False
+        with state["lock"]:
+            state["connections"] += 1
+
+    def send(self, to, subject, contents):
+        with self.state["lock"]:
+            if self.state["failures"].get(to, 0) > 0:
+                self.state["failures"][to] -= 1
+                raise ConnectionError(f"dropped while sending to {to}")
+            self.state["sent"].append(to)
+
+    def close(self):
+        self.closed = True
+        with self.state["lock"]:
+            self.state["closed"] += 1
+
+
+@pytest.fixture
+def smtp():
+    state = {"lock": threading.Lock(), "connections": 0, "closed": 0, "sent": [], "failures": {}}
+    return state, lambda: StubSMTP(state)
+
+
+def messages(n):
+    return [Message(to=f"user{i}@example.com", subject="s", contents="c") for i in range(n)]
+
+
+def test_sends_everything_and_closes_connections(smtp):
+    state, connect = smtp
+    report = DeliveryEngine(connect, workers=3, backoff=0).send_all(messages(20))
+    assert report.sent == 20 and report.failed == 0
+    assert sorted(state["sent"]) == sorted(m.to for m in messages(20))
+    assert len(report.latencies) == 20
+    assert state["connections"] <= 3
+    assert state["closed"] == state["connections"]
+
+
+def test_retry_reconnects_after_a_dropped_connection(smtp, monkeypatch):
+    state, connect = smtp
+    state["failures"]["user0@example.com"] = 2
+    sleeps = []
+    monkeypatch.setattr(mailer.time, "sleep", sleeps.append)
+    report = DeliveryEngine(connect, workers=1, retries=3, backoff=0.5).send_all(messages(1))
+    assert report.sent == 1
+    assert sleeps == [0.5, 1.0]  # exponential backoff
+    assert state["connections"] == 3  # a fresh connection after each failure
+    assert state["closed"] == 3
+
+
+def test_gives_up_after_retries(smtp, monkeypatch):
+    state, connect = smtp
+    state["failures"]["user1@example.com"] = 10
+    monkeypatch.setattr(mailer.time, "sleep", lambda seconds: None)
+    report = DeliveryEngine(connect, workers=2, retries=2).send_all(messages(3))
+    assert report.sent == 2 and report.failed == 1
+    assert "ConnectionError" in report.errors["user1@example.com"]
+    assert state["failures"]["user1@example.com"] == 7  # 1 attempt + 2 retries
+
+
+def test_journal_skips_delivered_and_records_new(smtp, tmp_path):
+    state, connect = smtp
+    path = tmp_path / "journal.log"
+    path.write_text("user0@example.com\n")
+    report = DeliveryEngine(connect, workers=2, journal=Journal(str(path))).send_all(messages(3))
+    assert report.skipped == 1 and report.sent == 2
+    assert "user0@example.com" not in state["sent"]
+    assert set(path.read_text().split()) == {f"user{i}@example.com" for i in range(3)}
+
+    rerun = DeliveryEngine(connect, workers=2, journal=Journal(str(path))).send_all(messages(3))
+    assert rerun.skipped == 3 and rerun.sent == 0
+
+
+def test_token_bucket_limits_the_send_rate(smtp):
+    state, connect = smtp
+    start = time.monotonic()
+    report = DeliveryEngine(connect, workers=2, rate=50).send_all(messages(12))
+    elapsed = time.monotonic() - start
+    assert report.sent == 12
+    assert elapsed >= (12 - 2) / 50 * 0.9  # burst of `workers`, then 50/s
+
+
+def test_token_bucket_burst():
+    bucket = TokenBucket(rate=1000, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_delivers_through_a_local_smtp_server():
+    controller_mod = pytest.importorskip("aiosmtpd.controller")
+    yagmail = pytest.importorskip("yagmail")
+
+    received = []
+
+    class Handler:
+        async def handle_DATA(self, server, session, envelope):
+            received.append(envelope.rcpt_tos[0])
+            return "250 OK"
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    controller = controller_mod.Controller(Handler(), hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        connect = lambda: yagmail.SMTP(user="sender@example.com", host="127.0.0.1", port=port,
+                                       smtp_starttls=False, smtp_ssl=False, smtp_skip_login=True)
+        report = DeliveryEngine(connect, workers=2, backoff=0).send_all(messages(4))
+    finally:
+        controller.stop()
+    assert report.sent == 4, report.errors
+    assert sorted(received) == sorted(m.to for m in messages(4))
+
+
+def test_consumes_messages_lazily(smtp):
+    state, connect = smtp
+    pulled = []
+
+    def source():
+        for message in messages(50):
+            # never more than 2 * workers pulled ahead of the completed sends
+            assert len(pulled) - len(state["sent"]) <= 2 * 2 + 1
+            pulled.append(message.to)
+            yield message
+
+    report = DeliveryEngine(connect, workers=2, backoff=0).send_all(source())
+    assert report.sent == 50
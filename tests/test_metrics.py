@@ -0,0 +1,44 @@
+import json
+
+from jobs.mailer import DeliveryReport
+from jobs.metrics import JobMetrics, mask_email, percentile
+
+
+def test_one_percentile_rule_everywhere():
+    latencies = [0.4, 0.1, 0.3, 0.2, 1.0]
+    report = DeliveryReport(sent=5, latencies=latencies)
+    metrics = JobMetrics("test")
+    metrics.record_delivery(report)
+    summary = metrics.summary()
+    for pct in (50, 90, 95, 99):
+        assert report.percentile(pct) == percentile(latencies, pct) == summary["latency_s"][f"p{pct}"]
+    assert summary["latency_s"]["max"] == 1.0
+
+
+def test_nested_phases_record_exclusive_time(monkeypatch):
+    clock = iter([0.0, 0.0, 1.0, 3.0, 4.0])  # start, smtp in, db in, db out, smtp out
+    monkeypatch.setattr("jobs.metrics.time.perf_counter", lambda: next(clock))
+    metrics = JobMetrics("test")
+    with metrics.phase("smtp"):
+        with metrics.phase("db"):
+            pass
+    assert metrics.phases == {"smtp": 2.0, "db": 2.0}
+
+
+def test_emit_writes_the_metrics_file(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "metrics.jsonl"
+    monkeypatch.setenv("JOB_METRICS_FILE", str(path))
+    metrics = JobMetrics("daily_reminder")
+    metrics.count("rendered", 3)
+    metrics.record_delivery(DeliveryReport(sent=2, failed=1, latencies=[0.5, 0.7]))
+    metrics.emit()
+    printed = capsys.readouterr().out
+    assert printed.startswith("METRICS ")
+    record = json.loads(path.read_text())
+    assert record == json.loads(printed[len("METRICS "):])
+    assert record["counters"] == {"rendered": 3, "sent": 2, "failed": 1, "skipped": 0}
+
+
+def test_mask_email():
+    assert mask_email("jane@example.com") == "j***@example.com"
+    assert mask_email("not-an-address") == "***"
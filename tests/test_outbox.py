@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bench.fake_supabase import FakeSupabase
+from jobs import mailer
+from outbox import CLAIM_TIMEOUT, MAX_ATTEMPTS, drain_outbox
+
+
+class StubSMTP:
+    def __init__(self, sent, failing):
+        self.sent = sent
+        self.failing = failing
+
+    def send(self, to, subject, contents):
+        if to in self.failing:
+            raise ConnectionError(f"rejected {to}")
+        self.sent.append(to)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    monkeypatch.setattr(mailer.time, "sleep", lambda seconds: None)
+    sent, failing = [], set()
+    return sent, failing, lambda: StubSMTP(sent, failing)
+
+
+def outbox_row(id, **overrides):
+    row = {"id": id, "kind": "welcome", "to_email": f"user{id}@example.com", "name": f"User {id}",
+           "status": "pending", "attempts": 0, "last_error": None, "claimed_at": None, "sent_at": None}
+    return {**row, **overrides}
+
+
+def client_with(*rows):
+    client = FakeSupabase()
+    client.tables["email_outbox"] = list(rows)
+    return client
+
+
+def by_id(client):
+    return {row["id"]: row for row in client.tables["email_outbox"]}
+
+
+def ago(delta):
+    return (datetime.now(timezone.utc) - delta).isoformat()
+
+
+def test_pending_rows_are_sent_and_marked(smtp):
+    sent, _, connect = smtp
+    client = client_with(outbox_row(1), outbox_row(2))
+    report = drain_outbox(client, connect)
+    assert report.sent == 2 and sorted(sent) == ["user1@example.com", "user2@example.com"]
+    assert all(row["status"] == "sent" and row["sent_at"] for row in by_id(client).values())
+
+
+def test_only_claimable_rows_are_sent(smtp):
+    sent, _, connect = smtp
+    client = client_with(
+        outbox_row(1, status="sending", claimed_at=ago(CLAIM_TIMEOUT + timedelta(minutes=1))),  # abandoned
+        outbox_row(2, status="sending", claimed_at=ago(timedelta(minutes=1))),  # another drainer has it
+        outbox_row(3, status="sent"),
+        outbox_row(4, status="failed", attempts=MAX_ATTEMPTS),
+        outbox_row(5, attempts=MAX_ATTEMPTS),
+    )
+    drain_outbox(client, connect)
+    assert sent == ["user1@example.com"]
+    rows = by_id(client)
+    assert rows[1]["status"] == "sent" and rows[2]["status"] == "sending"
+
+
+def test_failures_are_retried_until_max_attempts(smtp):
+    sent, failing, connect = smtp
+    failing.add("user1@example.com")
+    client = client_with(outbox_row(1))
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        report = drain_outbox(client, connect)
+        row = by_id(client)[1]
+        assert report.failed == 1 and row["attempts"] == attempt and "rejected" in row["last_error"]
+        assert row["status"] == ("failed" if attempt == MAX_ATTEMPTS else "pending")
+    assert drain_outbox(client, connect).failed == 0  # a failed row is never claimed again
+    assert sent == []
+
+
+def test_one_failed_status_update_does_not_skip_the_rest(smtp):
+    _, _, connect = smtp
+    client = client_with(outbox_row(1), outbox_row(2), outbox_row(3))
+    original = client.table
+    failed = []
+
+    def lost_connection():
+        raise ConnectionError("lost the database")
+
+    def table(name):
+        query = original(name)
+        update = query.update
+
+        def failing_update(values):
+            result = update(values)
+            if values.get("status") == "sent" and not failed:
+                failed.append(values)
+                result.execute = lost_connection
+            return result
+
+        query.update = failing_update
+        return query
+
+    client.table = table
+    drain_outbox(client, connect)
+    statuses = sorted(row["status"] for row in by_id(client).values())
+    assert statuses == ["sending", "sent", "sent"]
@@ -0,0 +1,26 @@
+import json
+
+from perf import PerfRecorder
+
+
+def test_export_matches_the_log_format(tmp_path):
+    path = tmp_path / "perf.jsonl"
+    recorder = PerfRecorder(window=3, log_path=str(path))
+    for ms in (5.0, 1.0, 3.0, 9.0):
+        recorder.record("load_tasks", ms)
+    recorder.record("show_tasks", 2.0)
+
+    logged = [json.loads(line) for line in path.read_text().splitlines()]
+    exported = [json.loads(line) for line in recorder.export_jsonl().splitlines()]
+    assert all(set(sample) == {"ts", "span", "ms"} for sample in logged + exported)
+    assert exported == logged[1:]  # the window keeps the last 3 load_tasks samples
+
+
+def test_summary_over_the_window():
+    recorder = PerfRecorder(window=4)
+    for ms in (100.0, 1.0, 2.0, 3.0, 4.0):
+        recorder.record("rerun", ms)
+    with recorder.span("tiny"):
+        pass
+    (row,) = [row for row in recorder.summary() if row["span"] == "rerun"]
+    assert row == {"span": "rerun", "count": 4, "last_ms": 4.0, "p50_ms": 3.0, "p95_ms": 4.0, "max_ms": 4.0}
@@ -0,0 +1,32 @@
+from task_feed import LocalFeed, SupabaseRealtimeFeed
+
+
+def test_local_feed_fans_out_and_isolates_failures():
+    feed, seen = LocalFeed(), []
+
+    def broken(rows):
+        raise RuntimeError("boom")
+
+    feed.subscribe(broken)
+    unsubscribe = feed.subscribe(seen.append)
+    feed.publish([{"id": 1}])
+    feed.publish([])  # "refetch" signal is passed on too
+    unsubscribe()
+    feed.publish([{"id": 2}])
+    assert seen == [[{"id": 1}], []]
+    assert feed.connected is False  # never sees other processes' writes
+
+
+def test_realtime_feed_drops_the_echo_of_its_own_writes():
+    feed, seen = SupabaseRealtimeFeed("http://localhost", "key"), []
+    feed.subscribe(seen.append)
+    own = {"id": 7, "user": "ana", "status": True, "points": 3}
+    feed.publish([own])
+    feed._on_change({"data": {"type": "UPDATE", "record": dict(own)}})
+    assert seen == [[own]]
+
+    # a later change by someone else to the same row gets through
+    other = dict(own, points=5)
+    feed._on_change({"data": {"type": "UPDATE", "record": other}})
+    feed._on_change({"record": {"id": 8, "user": "bo"}})  # older payload shape
+    assert seen == [[own], [other], [{"id": 8, "user": "bo"}]]
@@ -0,0 +1,142 @@
+# sql/task_points.sql and sql/users_without_tasks.sql against a throwaway local
+# Postgres (pgserver), checked against the fake RPCs in bench/fake_supabase.py
+# that the benchmark relies on; the fakes are also checked on hand-computed sums.
+import os
+
+import pytest
+
+from bench.fake_supabase import FakeSupabase
+from bench.synthetic import make_tasks, make_users
+from task_stats import TaskStats
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "sql")
+
+HAND_TASKS = [
+    # Mon 2024-01-01 and Sun 2024-01-07 share an ISO week; 2024-01-08 starts the next
+    {"id": 1, "user": "ana", "points": 3, "status": True, "date": "2024-01-01", "completed_date": "2024-01-01", "category": "Work"},
+    {"id": 2, "user": "ana", "points": 5, "status": True, "date": "2024-01-02", "completed_date": "2024-01-07", "category": "Home"},
+    {"id": 3, "user": "ana", "points": 2, "status": True, "date": "2024-01-08", "completed_date": "2024-01-08", "category": "Work"},
+    {"id": 4, "user": "bo", "points": 7, "status": True, "date": "2024-01-31", "completed_date": "2024-02-01", "category": "Work"},
+    {"id": 5, "user": "bo", "points": 9, "status": False, "date": "2024-02-01", "completed_date": None, "category": "Work"},
+]
+
+
+def test_fake_points_per_user_known_sums():
+    client = FakeSupabase(tasks=HAND_TASKS)
+    rpc = lambda **params: client.rpc("points_per_user", params).execute().data
+    assert rpc() == [{"user": "ana", "points": 10}, {"user": "bo", "points": 7}]
+    assert rpc(category_filter="Work") == [{"user": "ana", "points": 5}, {"user": "bo", "points": 7}]
+    assert rpc(after_user="ana") == [{"user": "bo", "points": 7}]
+    assert rpc(user_filter="bo", category_filter="Home") == []
+
+
+def test_fake_points_per_period_known_sums():
+    client = FakeSupabase(tasks=HAND_TASKS)
+    rpc = lambda **params: client.rpc("points_per_period", params).execute().data
+    assert rpc(period="week") == [
+        {"user": "ana", "period_start": "2024-01-01", "points": 8},
+        {"user": "ana", "period_start": "2024-01-08", "points": 2},
+        {"user": "bo", "period_start": "2024-01-29", "points": 7},
+    ]
+    assert rpc(period="month", user_filter="bo") == [{"user": "bo", "period_start": "2024-02-01", "points": 7}]
+    assert rpc(period="year") == []
+    assert rpc(period="week", after_user="ana", after_period="2024-01-01", page_size=1) == [
+        {"user": "ana", "period_start": "2024-01-08", "points": 2}]
+
+
+def test_stats_past_one_response_are_all_loaded():
+    # 100 users over a year is ~5,000 weekly totals, well over the 1000-row cap
+    tasks = make_tasks(20_000, 100)
+    stats = TaskStats(FakeSupabase(tasks=tasks)).get()
+    done = [task for task in tasks if task["status"]]
+    assert len(stats["Week"]) > 1000
+    for label in ("user", "Week", "Month"):
+        assert stats[label]["points"].sum() == sum(task["points"] for task in done)
+
+
+@pytest.fixture(scope="module")
+def postgres(tmp_path_factory):
+    pgserver = pytest.importorskip("pgserver")
+    psycopg = pytest.importorskip("psycopg")
+    server = pgserver.get_server(str(tmp_path_factory.mktemp("pg")), cleanup_mode="stop")
+    conn = psycopg.connect(server.get_uri(), autocommit=True)
+    conn.execute("""
+        create table users (id bigint primary key, "user" text, mail text);
+        create table tasks (
+            id bigint primary key, "user" text, task text, points int, status boolean,
+            date date, completed_date date, category text, deadline_category text);
+    """)
+    for name in ("task_points.sql", "users_without_tasks.sql"):
+        with open(os.path.join(SQL_DIR, name), encoding="utf-8") as f:
+            conn.execute(f.read())
+    yield conn
+    conn.close()
+    server.cleanup()
+
+
+@pytest.fixture(scope="module")
+def seeded(postgres):
+    tasks, users = make_tasks(3000, 12, days=120), make_users(15)
+    with postgres.cursor() as cur:
+        cur.executemany(
+            'insert into tasks (id, "user", task, points, status, date, completed_date, category, deadline_category) '
+            "values (%(id)s, %(user)s, %(task)s, %(points)s, %(status)s, %(date)s, %(completed_date)s, "
+            "%(category)s, %(deadline_category)s)", tasks)
+        cur.executemany('insert into users (id, "user", mail) values (%(id)s, %(user)s, %(mail)s)', users)
+    return postgres, FakeSupabase(tasks=tasks, users=users), tasks
+
+
+def call(conn, function, **params):
+    from psycopg.rows import dict_row
+
+    names = ", ".join(f"{name} => %({name})s" for name in params)
+    with conn.cursor(row_factory=dict_row) as cur:
+        rows = cur.execute(f"select * from {function}({names})", params).fetchall()
+    return [{key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in row.items()}
+            for row in rows]
+
+
+@pytest.mark.parametrize("user_filter, category_filter", [(None, None), ("user0003", None), (None, "Work"), ("user0003", "Work")])
+def test_points_per_user_matches_fake(seeded, user_filter, category_filter):
+    conn, fake, tasks = seeded
+    params = {"user_filter": user_filter, "category_filter": category_filter}
+    expected = fake.rpc("points_per_user", params).execute().data
+    assert call(conn, "points_per_user", **params) == expected
+    done = [t for t in tasks if t["status"] and user_filter in (None, t["user"]) and category_filter in (None, t["category"])]
+    assert sum(row["points"] for row in expected) == sum(t["points"] for t in done)
+
+
+@pytest.mark.parametrize("period", ["week", "month"])
+@pytest.mark.parametrize("user_filter, category_filter", [(None, None), ("user0003", "Work")])
+def test_points_per_period_matches_fake(seeded, period, user_filter, category_filter):
+    conn, fake, _ = seeded
+    params = {"period": period, "user_filter": user_filter, "category_filter": category_filter}
+    assert call(conn, "points_per_period", **params) == fake.rpc("points_per_period", params).execute().data
+
+
+def test_users_without_tasks_matches_fake(seeded):
+    conn, fake, tasks = seeded
+    day = tasks[-1]["date"]
+    params = {"day": day, "after_id": 0, "page_size": 1000}
+    assert call(conn, "users_without_tasks", **params) == fake.rpc("users_without_tasks", params).execute().data
+
+
+@pytest.mark.parametrize("function, params, keys", [
+    ("points_per_user", {}, {"user": "after_user"}),
+    ("points_per_period", {"period": "week"}, {"user": "after_user", "period_start": "after_period"}),
+    ("points_per_period", {"period": "month", "category_filter": "Work"},
+     {"user": "after_user", "period_start": "after_period"}),
+])
+def test_paged_points_match_fake(seeded, function, params, keys):
+    # Small pages, so the keyset resumes many times over the seeded totals
+    conn, fake, _ = seeded
+    after, pages = dict.fromkeys(keys.values()), 0
+    while True:
+        page_params = {**params, **after, "page_size": 7}
+        page = call(conn, function, **page_params)
+        assert page == fake.rpc(function, page_params).execute().data
+        pages += 1
+        if len(page) < 7:
+            break
+        after = {param: page[-1][column] for column, param in keys.items()}
+    assert pages > 1
@@ -0,0 +1,29 @@
+from bench.fake_supabase import FakeSupabase
+from bench.synthetic import make_tasks
+from task_sync import TaskSync, to_frame
+
+
+def test_empty_frame_keeps_int_ids():
+    assert to_frame([])["id"].dtype == "int64"
+
+
+def test_apply_keeps_the_column_types():
+    tasks = make_tasks(200, 5)
+    view = TaskSync(FakeSupabase(tasks=tasks))
+    dtypes = view.get().dtypes
+
+    done = dict(next(row for row in tasks if not row["status"]), status=True)
+    view.apply([done])  # only drops a row, nothing to add
+    assert done["id"] not in set(view.df["id"])
+    assert view.df.dtypes.equals(dtypes)
+
+    new = dict(done, id=1000, status=False)
+    view.apply([new])
+    assert view.df["id"].iloc[-1] == 1000
+    assert view.df.dtypes.equals(dtypes)
+
+
+def test_open_tasks_past_one_response_are_all_loaded():
+    tasks = make_tasks(30_000, 50)  # 1,500 open, over the fake's 1000-row cap
+    df = TaskSync(FakeSupabase(tasks=tasks)).get()
+    assert sorted(df["id"]) == [row["id"] for row in tasks if not row["status"]]